@@ -0,0 +1,324 @@
+"""Optional local HTTP/JSON API over the countdown events database.
+
+Run with:
+    python api_server.py                  # http://127.0.0.1:8765
+    python api_server.py --port 9000 --db other.db
+
+Endpoints:
+    GET    /events                  active events by date (?all=1 adds deleted ones,
+                                    ?from=YYYY-MM-DD&to=YYYY-MM-DD limits the window)
+    GET    /events/next             the next upcoming event (null if none)
+    GET    /events/upcoming         upcoming events, soonest first (?limit=10)
+    GET    /events/<id>             one event
+    POST   /events                  add an event from a JSON object
+    PATCH  /events/<id>             change some fields of an event (PUT works too)
+    DELETE /events/<id>             soft delete (?hard=1 deletes permanently)
+    GET    /stats                   event and notification counts
+
+Every GET response carries an ETag built from the database's change counter,
+SQLite's data_version (writes by other processes, such as the desktop app)
+and today's date. Repeat polls that send it back in If-None-Match get a 304,
+and other repeat GETs are answered from a response cache; neither touches
+SQLite until something changes.
+
+The server only listens on 127.0.0.1 and handles every request on the event
+loop thread, which owns its database connection.
+"""
+import argparse
+import asyncio
+import json
+from datetime import date
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from database import DATABASE_FILE, DatabaseManager, event_json, event_values_from_record
+from date_utils import today_ordinal
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+
+# How often (seconds) SQLite is asked whether another process wrote to the database
+DATA_VERSION_POLL = 0.5
+
+# Distinct GET targets kept in the response cache between changes
+RESPONSE_CACHE_SIZE = 256
+
+# Request bodies are single events; anything bigger is refused
+MAX_BODY_BYTES = 1024 * 1024
+
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_TIMEOUT = 30
+
+class ApiError(Exception):
+    """An error answered with the given HTTP status and a JSON message"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def query_date(query: Dict, name: str, default: str) -> str:
+    value = query.get(name, [default])[-1]
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ApiError(400, f"invalid {name} date '{value}' (expected YYYY-MM-DD)") from None
+
+def query_int(query: Dict, name: str, default: int) -> int:
+    value = query.get(name, [default])[-1]
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(400, f"invalid {name} '{value}'") from None
+
+class ApiServer:
+    """asyncio HTTP/1.1 server answering JSON requests from a DatabaseManager"""
+    
+    def __init__(self, db_manager: DatabaseManager, port: int = API_PORT):
+        self.db_manager = db_manager
+        self.port = port
+        self._server = None
+        self._watcher = None
+        self._data_version = 0
+        
+        # target -> encoded JSON body of GET responses for _cache_version
+        self._cache = {}
+        self._cache_version = None
+    
+    async def start(self):
+        """Bind to 127.0.0.1 (port 0 picks a free port, stored in self.port)"""
+        self._data_version = self.db_manager.data_version()
+        self._server = await asyncio.start_server(self._serve_connection, API_HOST, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._watcher = asyncio.create_task(self._watch_data_version())
+    
+    async def serve_forever(self):
+        """Serve until cancelled; call start() first"""
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+    
+    async def close(self):
+        if self._watcher:
+            self._watcher.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+    
+    async def _watch_data_version(self):
+        """Notice commits from other connections, which change_counter never sees"""
+        while True:
+            await asyncio.sleep(DATA_VERSION_POLL)
+            self._data_version = self.db_manager.data_version()
+    
+    def version(self) -> Tuple[int, int, int]:
+        """Changes whenever any GET response could change"""
+        return (self.db_manager.change_counter, self._data_version, today_ordinal())
+    
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                
+                try:
+                    method, target, http_version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    writer.write(self._response(400, {}, {'error': "malformed request"}, False))
+                    break
+                if length > MAX_BODY_BYTES:
+                    writer.write(self._response(413, {}, {'error': "request body too large"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+                
+                connection = headers.get("connection", "").lower()
+                keep_alive = (connection != "close" if http_version == "HTTP/1.1"
+                              else connection == "keep-alive")
+                
+                status, extra_headers, payload = self.handle(method, target, headers, body)
+                writer.write(self._response(status, extra_headers, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # Dropped connections and header lines past the StreamReader limit
+            pass
+        finally:
+            writer.close()
+    
+    def _response(self, status: int, extra_headers: Dict[str, str], payload, keep_alive: bool) -> bytes:
+        """Serialize a response; payload is encoded JSON bytes, a JSON-ready value or None"""
+        if payload is not None and not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode("utf-8")
+        
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        if payload is not None:
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(payload) if payload is not None else 0}")
+        lines.extend(f"{name}: {value}" for name, value in extra_headers.items())
+        if not keep_alive:
+            lines.append("Connection: close")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head + payload if payload is not None else head
+    
+    def handle(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        """Answer one request: returns (status, extra headers, payload)"""
+        try:
+            if method == "GET":
+                return self._handle_get(target, headers)
+            
+            parts = urlsplit(target)
+            payload = json.loads(body or b"null") if method in ("POST", "PATCH", "PUT") else None
+            status, result, extra_headers = self._route_write(
+                method, parts.path.rstrip("/"), parse_qs(parts.query), payload
+            )
+            return status, extra_headers, result
+        except ApiError as e:
+            return e.status, {}, {'error': str(e)}
+        except ValueError as e:
+            # Invalid JSON bodies and records rejected by event_values_from_record
+            return 400, {}, {'error': str(e)}
+        except Exception as e:
+            print(f"Error in API request {method} {target}: {e}")
+            return 500, {}, {'error': "internal error"}
+    
+    def _handle_get(self, target: str, headers: Dict[str, str]):
+        version = self.version()
+        etag = '"%d-%d-%d"' % version
+        if headers.get("if-none-match") == etag:
+            return 304, {'ETag': etag}, None
+        
+        if self._cache_version != version:
+            self._cache = {}
+            self._cache_version = version
+        
+        cached = self._cache.get(target)
+        if cached is None:
+            parts = urlsplit(target)
+            result = self._route_get(parts.path.rstrip("/"), parse_qs(parts.query))
+            if len(self._cache) >= RESPONSE_CACHE_SIZE:
+                self._cache.clear()
+            cached = self._cache[target] = json.dumps(result).encode("utf-8")
+        
+        return 200, {'ETag': etag, 'Cache-Control': "no-cache"}, cached
+    
+    def _route_get(self, path: str, query: Dict):
+        db_manager = self.db_manager
+        
+        if path == "/events":
+            active_only = query.get("all", ["0"])[-1] not in ("1", "true")
+            if "from" in query or "to" in query:
+                events = db_manager.get_events_between(query_date(query, "from", "0001-01-01"),
+                                                       query_date(query, "to", "9999-12-31"),
+                                                       active_only)
+            else:
+                events = db_manager.get_all_events(active_only)
+            return [event_json(event) for event in events]
+        
+        if path == "/events/next":
+            event = db_manager.get_next_upcoming_event()
+            return event_json(event) if event else None
+        
+        if path == "/events/upcoming":
+            events = db_manager.get_upcoming_events(limit=query_int(query, "limit", 10))
+            return [event_json(event) for event in events]
+        
+        if path == "/stats":
+            return db_manager.get_event_stats()
+        
+        event_id = self._event_id(path)
+        event = db_manager.get_event_by_id(event_id)
+        if event is None:
+            raise ApiError(404, f"event {event_id} not found")
+        return event_json(event)
+    
+    def _route_write(self, method: str, path: str, query: Dict, payload):
+        db_manager = self.db_manager
+        
+        if path == "/events":
+            if method != "POST":
+                raise ApiError(405, f"{method} not allowed on /events")
+            event_id = db_manager.add_event_from_record(payload)
+            return 201, event_json(db_manager.get_event_by_id(event_id)), {'Location': f"/events/{event_id}"}
+        
+        event_id = self._event_id(path)
+        event = db_manager.get_event_by_id(event_id)
+        if event is None:
+            raise ApiError(404, f"event {event_id} not found")
+        
+        if method in ("PATCH", "PUT"):
+            if not isinstance(payload, dict):
+                raise ApiError(400, "request body must be a JSON object")
+            # Validate the event as it will be after the change
+            merged = event.copy()
+            merged.update(payload)
+            (name, description, event_date, notification_enabled,
+             days_before, theme_color, priority) = event_values_from_record(merged)
+            changes = dict(name=name, description=description, event_date=event_date,
+                           notification_enabled=notification_enabled,
+                           notification_days_before=days_before,
+                           theme_color=theme_color, priority=priority)
+            if 'is_active' in payload:
+                # A JSON bool or 0/1 only; the string "false" must not re-activate it
+                is_active = payload['is_active']
+                if not isinstance(is_active, int) or is_active not in (0, 1):
+                    raise ApiError(400, f"invalid is_active {json.dumps(is_active)} (expected true or false)")
+                changes['is_active'] = int(is_active)
+            db_manager.update_event(event_id, **changes)
+            return 200, event_json(db_manager.get_event_by_id(event_id)), {}
+        
+        if method == "DELETE":
+            if query.get("hard", ["0"])[-1] in ("1", "true"):
+                db_manager.hard_delete_event(event_id)
+            else:
+                db_manager.delete_event(event_id)
+            return 204, None, {}
+        
+        raise ApiError(405, f"{method} not allowed on {path}")
+    
+    @staticmethod
+    def _event_id(path: str) -> int:
+        prefix, _, event_id = path.rpartition("/")
+        if prefix != "/events" or not event_id.isdigit():
+            raise ApiError(404, f"no such endpoint {path or '/'}")
+        return int(event_id)
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API for countdown events")
+    parser.add_argument("--db", default=DATABASE_FILE, metavar="PATH",
+                        help=f"database file (default: {DATABASE_FILE})")
+    parser.add_argument("--port", type=int, default=API_PORT,
+                        help=f"port on {API_HOST} (default: {API_PORT})")
+    args = parser.parse_args(argv)
+    
+    db_manager = DatabaseManager(args.db)
+    server = ApiServer(db_manager, args.port)
+    
+    async def serve():
+        await server.start()
+        print(f"Serving {args.db} on http://{API_HOST}:{server.port}")
+        await server.serve_forever()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
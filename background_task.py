@@ -0,0 +1,96 @@
+import threading
+from typing import Callable
+
+class TaskCancelled(Exception):
+    """Raised inside a job when the user cancelled it"""
+
+class BackgroundTask:
+    """Run a long job on a worker thread and report back on the Tk thread.
+    
+    The job is called as job(task) and should call task.report(done, total)
+    as it goes; report() raises TaskCancelled once cancel() was called.
+    Progress, the result and errors are delivered through root.after by
+    polling from the Tk thread, so callbacks may touch widgets freely.
+    A job stopped by cancel() ends in on_cancelled, not on_done; a job that
+    finished before it saw the cancel request still ends in on_done.
+    on_exit is called on the worker thread once the job has returned, to
+    release per-thread resources such as a pooled database connection.
+    """
+    
+    POLL_MS = 100
+    
+    def __init__(self, root, job: Callable, on_progress: Callable = None,
+                 on_done: Callable = None, on_error: Callable = None,
+                 on_cancelled: Callable = None, on_exit: Callable = None):
+        self.root = root
+        self.job = job
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.on_exit = on_exit
+        
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        # Latest (done, total) not yet shown; older values are simply dropped
+        self._progress = None
+        self._outcome = None
+        self._thread = None
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.root.after(self.POLL_MS, self._poll)
+    
+    def cancel(self):
+        """Ask the job to stop at its next report()"""
+        self._cancelled.set()
+    
+    def report(self, done: int, total: int = None):
+        """Record progress from the worker thread"""
+        with self._lock:
+            self._progress = (done, total)
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+    
+    def _run(self):
+        try:
+            outcome = ("done", self.job(self))
+        except TaskCancelled:
+            outcome = ("cancelled", None)
+        except Exception as e:
+            outcome = ("error", e)
+        finally:
+            if self.on_exit:
+                try:
+                    self.on_exit()
+                except Exception as e:
+                    print(f"Error releasing background task resources: {e}")
+        with self._lock:
+            self._outcome = outcome
+    
+    def _poll(self):
+        with self._lock:
+            progress, self._progress = self._progress, None
+            outcome = self._outcome
+        
+        if progress is not None and self.on_progress:
+            self.on_progress(*progress)
+        
+        if outcome is None:
+            self.root.after(self.POLL_MS, self._poll)
+            return
+        
+        status, value = outcome
+        if status == "error":
+            if self.on_error:
+                self.on_error(value)
+        elif status == "cancelled":
+            if self.on_cancelled:
+                self.on_cancelled()
+        elif self.on_done:
+            self.on_done(value)
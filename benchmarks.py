@@ -0,0 +1,591 @@
+"""Headless benchmarks for the countdown widget.
+
+Run with:
+    python benchmarks.py                          # every benchmark, 10 / 10k / 1M events
+    python benchmarks.py db_crud --sizes 10 10000 # selected benchmarks and sizes
+    python benchmarks.py --json results.json      # also write machine-readable results
+
+Each benchmark gets a fresh temporary database seeded with synthetic events,
+so results are comparable between runs and releases.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from database import DatabaseManager, Event
+from date_utils import date_ordinal, days_until, parse_date, today_ordinal
+
+DEFAULT_SIZES = (10, 10_000, 1_000_000)
+
+# Per-call operations (add_event, get_event_by_id, ...) are timed over at most
+# this many calls and reported as seconds per call
+MAX_SINGLE_OPS = 1_000
+
+def make_event_rows(count: int):
+    """Synthetic rows shaped like SELECT EVENT_COLUMNS FROM events.
+    
+    Dates run from a month ago to ten years ahead, so every dataset has past,
+    current and upcoming events.
+    """
+    start = date.today() - timedelta(days=30)
+    return [
+        (
+            i + 1, f"Event {i}", "", (start + timedelta(days=i % 3680)).isoformat(),
+            "2025-01-01 00:00:00", "2025-01-01 00:00:00",
+            1, 1, (1, 3, 7)[i % 3], "#013220", i % 5 + 1
+        )
+        for i in range(count)
+    ]
+
+def make_events(count: int):
+    """Synthetic Event records with days_remaining set, sorted like refresh_events"""
+    from event_list import event_sort_key
+    
+    today = today_ordinal()
+    events = [Event(*row) for row in make_event_rows(count)]
+    for event in events:
+        event['days_remaining'] = event.ordinal - today
+    events.sort(key=event_sort_key)
+    return events
+
+def seed_database(db_manager: DatabaseManager, count: int):
+    """Bulk-load synthetic events straight into the events table"""
+    with db_manager.transaction() as cursor:
+        cursor.executemany('''
+            INSERT INTO events (id, name, description, event_date, created_at, updated_at,
+                                is_active, notification_enabled, notification_days_before,
+                                theme_color, priority)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', make_event_rows(count))
+
+class seeded_database:
+    """Context manager yielding a DatabaseManager on a temporary, seeded database"""
+    
+    def __init__(self, count: int):
+        self.count = count
+    
+    def __enter__(self) -> DatabaseManager:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.tmpdir.name, "bench.db"))
+        seed_database(self.db_manager, self.count)
+        return self.db_manager
+    
+    def __exit__(self, *exc):
+        self.db_manager.close()
+        self.tmpdir.cleanup()
+
+def timed(func, *args, **kwargs):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def per_call(func, calls: int):
+    """Average seconds per call of func(i) for i in range(calls)"""
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / max(calls, 1)
+
+def row_to_dict(row):
+    """The per-row dict the database layer used to build by hand"""
+    return {
+        'id': row[0],
+        'name': row[1],
+        'description': row[2],
+        'event_date': row[3],
+        'created_at': row[4],
+        'updated_at': row[5],
+        'is_active': row[6],
+        'notification_enabled': row[7],
+        'notification_days_before': row[8],
+        'theme_color': row[9],
+        'priority': row[10]
+    }
+
+def _measure_allocations(build, rows):
+    """Return (bytes allocated, seconds) for building one record per row"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [build(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return allocated, elapsed
+
+# Benchmarks. Each takes the dataset size and returns a flat dict of metrics;
+# metric names ending in _seconds are timings, _bytes are memory.
+
+def bench_event_memory(size: int):
+    """Memory and build time of dict rows vs Event records"""
+    rows = make_event_rows(size)
+    dict_bytes, dict_seconds = _measure_allocations(row_to_dict, rows)
+    event_bytes, event_seconds = _measure_allocations(lambda row: Event(*row), rows)
+    return {
+        'dict_bytes': dict_bytes,
+        'dict_seconds': dict_seconds,
+        'event_bytes': event_bytes,
+        'event_seconds': event_seconds,
+        'saved_ratio': 1 - event_bytes / dict_bytes if dict_bytes else 0.0
+    }
+
+def bench_days_remaining(size: int):
+    """days_remaining for `size` event dates: strptime vs the cached ordinal path"""
+    dates = [row[3] for row in make_event_rows(size)]
+    results = {}
+    
+    def with_strptime():
+        today = datetime.now().date()
+        return [(datetime.strptime(d, "%Y-%m-%d").date() - today).days for d in dates]
+    
+    def with_fromisoformat():
+        today = date.today()
+        return [(date.fromisoformat(d) - today).days for d in dates]
+    
+    def with_ordinals():
+        today = today_ordinal()
+        return [date_ordinal(d) - today for d in dates]
+    
+    def with_event_ordinals():
+        today = today_ordinal()
+        for event in events:
+            event['days_remaining'] = event.ordinal - today
+    
+    results['strptime_seconds'], expected = timed(with_strptime)
+    results['fromisoformat_seconds'], _ = timed(with_fromisoformat)
+    for cache in (parse_date, date_ordinal):
+        cache.cache_clear()
+    results['ordinal_cold_seconds'], _ = timed(with_ordinals)
+    results['ordinal_warm_seconds'], actual = timed(with_ordinals)
+    assert actual == expected
+    
+    # Refresh path: ordinals stored on the loaded Event records
+    events = [Event(*row) for row in make_event_rows(size)]
+    results['event_ordinal_cold_seconds'], _ = timed(with_event_ordinals)
+    results['event_ordinal_warm_seconds'], _ = timed(with_event_ordinals)
+    results['days_until_seconds'] = per_call(lambda i: days_until(dates[i % size]),
+                                             min(size, MAX_SINGLE_OPS))
+    results['speedup'] = results['strptime_seconds'] / results['event_ordinal_warm_seconds']
+    return results
+
+def bench_db_crud(size: int):
+    """DatabaseManager reads and writes against a table of `size` events"""
+    results = {}
+    calls = min(size, MAX_SINGLE_OPS)
+    
+    with seeded_database(size) as db:
+        results['get_all_events_seconds'], _ = timed(db.get_all_events)
+        results['get_event_by_id_seconds'] = per_call(
+            lambda i: db.get_event_by_id(i % size + 1), calls
+        )
+        results['get_upcoming_events_seconds'] = per_call(
+            lambda i: db.get_upcoming_events(limit=10), calls
+        )
+        
+        results['next_upcoming_seconds'] = per_call(
+            lambda i: db.get_next_upcoming_event(), calls
+        )
+        
+        after = None
+        pages = 0
+        start = time.perf_counter()
+        for _ in range(max(calls // 10, 1)):
+            page = db.get_events_page(after=after, limit=100)
+            pages += 1
+            if not page:
+                break
+            after = (page[-1]['event_date'], page[-1]['id'])
+        results['get_events_page_seconds'] = (time.perf_counter() - start) / pages
+        
+        results['add_event_seconds'] = per_call(
+            lambda i: db.add_event(f"New {i}", "2030-01-01", priority=2), calls
+        )
+        results['update_event_seconds'] = per_call(
+            lambda i: db.update_event(i % size + 1, name=f"Renamed {i}"), calls
+        )
+        results['delete_event_seconds'] = per_call(
+            lambda i: db.delete_event(i % size + 1), calls
+        )
+    return results
+
+def bench_app_hot_paths(size: int):
+    """CountdownApp.get_next_upcoming_event and the load/sort in refresh_events"""
+    from enhanced_countdown_app import CountdownApp
+    
+    results = {}
+    with seeded_database(size) as db:
+        # Stand-in for the Tk parts of CountdownApp; only the data path is timed
+        app = SimpleNamespace(
+            db_manager=db,
+            current_events=[],
+            event_list=SimpleNamespace(set_events=lambda events: None),
+            show_default_countdown=lambda: None
+        )
+        
+        results['get_next_upcoming_event_seconds'] = per_call(
+            lambda i: CountdownApp.get_next_upcoming_event(app), min(size, MAX_SINGLE_OPS)
+        )
+        results['refresh_events_seconds'], _ = timed(CountdownApp.refresh_events, app)
+    return results
+
+def bench_notification_scan(size: int):
+    """Building the notification schedule from `size` events"""
+    from notifications import NotificationManager
+    
+    with seeded_database(size) as db:
+        manager = NotificationManager(db)
+        load_seconds, _ = timed(manager._load_schedule)
+        queued = len(manager._queue)
+        # A second load sees the ledger rows written by the first
+        reload_seconds, _ = timed(manager._load_schedule)
+    return {
+        'load_schedule_seconds': load_seconds,
+        'reload_schedule_seconds': reload_seconds,
+        'queued_notifications': queued
+    }
+
+def bench_tray_icon(size: int):
+    """Rendering tray icons for `size` countdown values (capped)"""
+    try:
+        import PIL  # noqa: F401
+    except ImportError as e:
+        return {'skipped': f"PIL unavailable ({e})"}
+    from system_tray import SystemTrayManager
+    
+    tray = SystemTrayManager(app_callback=None, quit_callback=None)
+    calls = min(size, MAX_SINGLE_OPS)
+    results = {
+        'render_icon_image_seconds': per_call(
+            lambda i: tray.render_icon_image(str(i % 1000)), calls
+        ),
+        # Repeated values, as when clicking between events
+        'cached_icon_image_seconds': per_call(
+            lambda i: tray.create_icon_image(str(i % 10)), calls
+        )
+    }
+    
+    tray.running = True
+    results['prerender_atlas_seconds'], _ = timed(tray.prerender_icon_atlas)
+    results['atlas_icon_image_seconds'] = per_call(
+        lambda i: tray.create_icon_image(str(i % 1000)), calls
+    )
+    return results
+
+def bench_theme_loading(size: int):
+    """ThemeManager start-up and theme switching"""
+    from theme_manager import ThemeManager
+    
+    calls = min(size, MAX_SINGLE_OPS)
+    with seeded_database(0) as db:
+        themes = list(ThemeManager.DEFAULT_THEMES)
+        results = {'init_seconds': per_call(lambda i: ThemeManager(db), calls)}
+        manager = ThemeManager(db)
+        results['load_current_theme_seconds'] = per_call(
+            lambda i: manager.load_current_theme(), calls
+        )
+        results['set_current_theme_seconds'] = per_call(
+            lambda i: manager.set_current_theme(themes[i % len(themes)]), calls
+        )
+        results['get_available_themes_seconds'] = per_call(
+            lambda i: manager.get_available_themes(), calls
+        )
+    return results
+
+def bench_json_export_import(size: int):
+    """JSON export of every event and re-import through the database layer"""
+    results = {}
+    with seeded_database(size) as db, tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "export.json")
+        
+        def export():
+            export_data = [event.copy() for event in db.get_all_events()]
+            with open(path, 'w') as f:
+                json.dump(export_data, f, indent=2)
+        
+        results['export_seconds'], _ = timed(export)
+        results['file_bytes'] = os.path.getsize(path)
+        
+        def load():
+            with open(path, 'r') as f:
+                return json.load(f)
+        
+        results['parse_seconds'], records = timed(load)
+        
+        results['bulk_import_seconds'], (imported, errors) = timed(db.bulk_add_events, records)
+        results['bulk_import_per_event_seconds'] = results['bulk_import_seconds'] / max(imported, 1)
+        
+        # The old import path: one add_event call (and transaction) per record
+        calls = min(len(records), MAX_SINGLE_OPS)
+        results['import_per_event_seconds'] = per_call(
+            lambda i: db.add_event(
+                records[i]['name'], records[i]['event_date'],
+                description=records[i]['description'], priority=records[i]['priority']
+            ),
+            calls
+        )
+    return results
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes"""
+    # On Linux ru_maxrss survives exec and so includes the parent's peak;
+    # VmHWM belongs to this process image only
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    
+    try:
+        import resource
+    except ImportError:
+        return 0  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _isolated_io_job(operation: str, db_path: str, filename: str):
+    """Run one streaming export/import in a fresh interpreter.
+    
+    Returns (seconds, rows, peak RSS in bytes) so the peak reflects only this
+    operation, not whatever the benchmark process allocated before.
+    """
+    from event_io import export_events_file, import_events_file
+    
+    db = DatabaseManager(db_path)
+    try:
+        start = time.perf_counter()
+        if operation == "export":
+            rows = export_events_file(db, filename)
+        else:
+            rows, _ = import_events_file(db, filename)
+        seconds = time.perf_counter() - start
+    finally:
+        db.close()
+    
+    return seconds, rows, _peak_rss()
+
+def bench_event_io(size: int):
+    """Streaming export and import in each file format: rows/sec and peak RSS"""
+    import multiprocessing
+    
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    with seeded_database(size) as db, tempfile.TemporaryDirectory() as tmpdir, \
+            context.Pool(1, maxtasksperchild=1) as pool:
+        # Interpreter + imports only, for comparison with the peaks below
+        results['baseline_rss_bytes'] = pool.apply(
+            _isolated_io_job, ("export", os.path.join(tmpdir, "empty.db"),
+                               os.path.join(tmpdir, "empty.json"))
+        )[2]
+        
+        for fmt in ("json", "ndjson", "csv", "ics"):
+            filename = os.path.join(tmpdir, f"events.{fmt}")
+            seconds, rows, peak = pool.apply(_isolated_io_job, ("export", db.db_path, filename))
+            results[f'{fmt}_export_rows_per_second'] = rows / seconds if seconds else 0.0
+            results[f'{fmt}_export_peak_rss_bytes'] = peak
+            results[f'{fmt}_file_bytes'] = os.path.getsize(filename)
+            
+            seconds, rows, peak = pool.apply(
+                _isolated_io_job, ("import", os.path.join(tmpdir, f"import_{fmt}.db"), filename)
+            )
+            results[f'{fmt}_import_rows_per_second'] = rows / seconds if seconds else 0.0
+            results[f'{fmt}_import_peak_rss_bytes'] = peak
+    return results
+
+def bench_event_list_refresh(size: int):
+    """Event list refresh: one card per event vs the virtualized list (needs a display)"""
+    try:
+        import customtkinter as ctk
+        from event_list import EventCard, VirtualEventList, event_card_content
+        from enhanced_countdown_app import COLORS
+    except Exception as e:
+        return {'skipped': f"GUI modules unavailable ({e})"}
+    
+    # The old one-card-per-event path takes minutes at 10k events
+    legacy_limit = 1_000
+    events = make_events(size)
+    results = {}
+    
+    start = time.perf_counter()
+    for event in events:
+        event_card_content(event, COLORS)
+    results['card_content_all_seconds'] = time.perf_counter() - start
+    
+    try:
+        root = ctk.CTk()
+        root.geometry("400x700")
+    except Exception as e:
+        results['skipped_widgets'] = f"no display available ({e})"
+        return results
+    
+    try:
+        if size <= legacy_limit:
+            frame = ctk.CTkFrame(root)
+            frame.pack(fill="both", expand=True)
+            start = time.perf_counter()
+            for event in events:
+                card = EventCard(frame, COLORS, VirtualEventList.CARD_HEIGHT, lambda e: None)
+                card.show_event(event)
+                card.frame.pack(fill="x", padx=10, pady=8)
+            root.update_idletasks()
+            results['rebuild_seconds'] = time.perf_counter() - start
+            frame.destroy()
+        
+        event_list = VirtualEventList(root, COLORS, on_select=lambda e: None)
+        event_list.pack(fill="both", expand=True)
+        root.update()
+        start = time.perf_counter()
+        event_list.set_events(events)
+        root.update_idletasks()
+        results['virtual_seconds'] = time.perf_counter() - start
+        results['virtual_cards'] = len(event_list.cards)
+    finally:
+        root.destroy()
+    return results
+
+def _api_requests(port: int, targets, extra_header: bytes = b"") -> float:
+    """Seconds for sequential GETs of `targets` over one keep-alive connection"""
+    import socket
+    
+    requests = [f"GET {target} HTTP/1.1\r\nHost: 127.0.0.1\r\n".encode() + extra_header + b"\r\n"
+                for target in targets]
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        response = sock.makefile("rb")
+        start = time.perf_counter()
+        for request in requests:
+            sock.sendall(request)
+            length = 0
+            while True:
+                line = response.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            response.read(length)
+        return time.perf_counter() - start
+
+def bench_api_server(size: int):
+    """Local HTTP API: requests/sec for cached, 304 and uncached polls"""
+    import asyncio
+    import threading
+    from api_server import ApiServer
+    
+    requests = 2_000
+    results = {}
+    with seeded_database(size) as db_manager:
+        server = ApiServer(db_manager, port=0)
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        
+        def serve():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(server.start())
+            ready.set()
+            loop.run_forever()
+        
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        ready.wait()
+        try:
+            results['next_first_request_seconds'] = _api_requests(server.port, ["/events/next"])
+            results['next_cached_requests_per_sec'] = requests / _api_requests(
+                server.port, ["/events/next"] * requests)
+            etag = '"%d-%d-%d"' % server.version()
+            results['next_304_requests_per_sec'] = requests / _api_requests(
+                server.port, ["/events/next"] * requests, f"If-None-Match: {etag}\r\n".encode())
+            # A new target per request misses the cache and queries SQLite
+            results['event_uncached_requests_per_sec'] = requests / _api_requests(
+                server.port, [f"/events/{i % size + 1}?n={i}" for i in range(requests)])
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+    return results
+
+BENCHMARKS = {
+    "event_memory": bench_event_memory,
+    "days_remaining": bench_days_remaining,
+    "db_crud": bench_db_crud,
+    "app_hot_paths": bench_app_hot_paths,
+    "notification_scan": bench_notification_scan,
+    "tray_icon": bench_tray_icon,
+    "theme_loading": bench_theme_loading,
+    "json_export_import": bench_json_export_import,
+    "event_io": bench_event_io,
+    "event_list_refresh": bench_event_list_refresh,
+    "api_server": bench_api_server,
+}
+
+def format_metric(name: str, value) -> str:
+    """Human-readable value for the console report"""
+    if isinstance(value, float) and name.endswith("_seconds"):
+        if value < 1e-3:
+            return f"{value * 1e6:10.1f} us"
+        return f"{value * 1000:10.1f} ms"
+    if isinstance(value, int) and name.endswith("_bytes"):
+        return f"{value / 1e6:10.1f} MB"
+    if isinstance(value, float):
+        return f"{value:10.3f}"
+    return f"{value!s:>10}"
+
+def run(names, sizes):
+    """Run benchmarks and return {benchmark: {size: metrics}}"""
+    results = {}
+    for name in names:
+        results[name] = {}
+        for size in sizes:
+            print(f"{name} @ {size:,} events")
+            sys.stdout.flush()
+            try:
+                metrics = BENCHMARKS[name](size)
+            except Exception as e:
+                metrics = {'error': f"{type(e).__name__}: {e}"}
+            results[name][str(size)] = metrics
+            for metric, value in metrics.items():
+                print(f"  {metric:<32} {format_metric(metric, value)}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Countdown widget benchmarks")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help="synthetic dataset sizes (number of events)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write results as JSON for regression tracking")
+    args = parser.parse_args()
+    
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    
+    results = run(args.benchmarks or list(BENCHMARKS), args.sizes)
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(timespec="seconds"),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'sqlite': sqlite3.sqlite_version,
+                'sizes': args.sizes,
+                'results': results
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
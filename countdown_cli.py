@@ -0,0 +1,270 @@
+"""Headless command line interface to the countdown events database.
+
+Run with:
+    python -m countdown_cli add "Launch" 2026-03-01 --priority high
+    python -m countdown_cli list --upcoming --limit 5
+    python -m countdown_cli next --json
+    python -m countdown_cli export - | python -m countdown_cli --db other.db bulk-import -
+    python -m countdown_cli purge --before 2025-01-01 --dry-run
+    python -m countdown_cli stats --json
+
+With --json every command prints JSON: single results as one object, event
+listings as one object per line (NDJSON), which bulk-import reads back from
+stdin. Only the database layer is imported, never the GUI, tray or
+notification toolkits, so the CLI works without a display.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+from datetime import date
+from itertools import islice
+
+from database import DATABASE_FILE, PRIORITY_BY_NAME, DatabaseManager, event_json
+from date_utils import days_until
+
+PRIORITY_NAMES = {level: name for name, level in PRIORITY_BY_NAME.items()}
+
+# Stream formats when reading stdin or writing stdout
+DEFAULT_STREAM_FORMAT = "ndjson"
+
+# Formats accepted by --format (kept in sync with event_io.READERS/WRITERS)
+STREAM_FORMATS = ("json", "ndjson", "csv", "ics")
+
+def iso_date(value: str) -> str:
+    """argparse type for YYYY-MM-DD arguments"""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)") from None
+
+def print_json(value):
+    print(json.dumps(value))
+
+def print_event_line(event):
+    """One table row: id, date, days remaining, priority and name"""
+    days = days_until(event['event_date'])
+    state = "" if event['is_active'] else "  (deleted)"
+    print(f"{event['id']:>7}  {event['event_date']}  {days:>6}d  "
+          f"{PRIORITY_NAMES.get(event['priority'], event['priority']):<8}  {event['name']}{state}")
+
+def open_stream(stream, fmt: str, write: bool = False):
+    """Re-wrap stdin/stdout as UTF-8 with the newline handling a format expects"""
+    from event_io import INPUT_ENCODING, RAW_NEWLINE_FORMATS
+    
+    newline = "" if fmt in RAW_NEWLINE_FORMATS else None
+    if write:
+        return io.TextIOWrapper(stream.buffer, encoding="utf-8", newline=newline,
+                                write_through=True)
+    return io.TextIOWrapper(stream.buffer, encoding=INPUT_ENCODING, newline=newline)
+
+def cmd_add(db_manager: DatabaseManager, args) -> int:
+    record = {
+        'name': args.name,
+        'event_date': args.date,
+        'description': args.description,
+        'priority': args.priority,
+        'notification_days_before': args.days_before,
+        'notification_enabled': not args.no_notify,
+    }
+    if args.color:
+        record['theme_color'] = args.color
+    event_id = db_manager.add_event_from_record(record)
+    
+    event = db_manager.get_event_by_id(event_id)
+    if args.json:
+        print_json(event_json(event))
+    else:
+        print(f"Added event {event_id}: {event['name']} on {event['event_date']}")
+    return 0
+
+def cmd_list(db_manager: DatabaseManager, args) -> int:
+    active_only = not args.all
+    if args.upcoming:
+        events = db_manager.get_upcoming_events(limit=args.limit or -1)
+    elif args.since or args.until:
+        events = db_manager.get_events_between(args.since or "0001-01-01",
+                                               args.until or "9999-12-31", active_only)
+    else:
+        events = db_manager.iter_events(active_only)
+    if args.limit:
+        events = islice(events, args.limit)
+    
+    for event in events:
+        if args.json:
+            print_json(event_json(event))
+        else:
+            print_event_line(event)
+    return 0
+
+def cmd_next(db_manager: DatabaseManager, args) -> int:
+    event = db_manager.get_next_upcoming_event()
+    if args.json:
+        print_json(event_json(event) if event else None)
+    elif event:
+        days = days_until(event['event_date'])
+        print(f"{event['name']} on {event['event_date']} "
+              f"({'today' if days == 0 else f'in {days} days'})")
+    else:
+        print("No upcoming events")
+    return 0
+
+def cmd_bulk_import(db_manager: DatabaseManager, args) -> int:
+    from event_io import READERS, format_for, import_events_file
+    
+    if args.source == "-":
+        fmt = args.format or DEFAULT_STREAM_FORMAT
+        imported, errors = db_manager.bulk_add_events(READERS[fmt](open_stream(sys.stdin, fmt)))
+    else:
+        imported, errors = import_events_file(db_manager, args.source,
+                                              fmt=args.format or format_for(args.source))
+    
+    if args.json:
+        print_json({
+            'imported': imported,
+            'errors': [{'record': index, 'error': message} for index, message in errors]
+        })
+    else:
+        print(f"Imported {imported} events")
+        for index, message in errors:
+            print(f"record {index}: {message}", file=sys.stderr)
+    return 1 if errors else 0
+
+def cmd_export(db_manager: DatabaseManager, args) -> int:
+    from event_io import WRITERS, export_events_file, format_for
+    
+    if args.destination == "-":
+        fmt = args.format or DEFAULT_STREAM_FORMAT
+        stream = open_stream(sys.stdout, fmt, write=True)
+        for _ in WRITERS[fmt](db_manager.iter_events(), stream):
+            pass
+        stream.flush()
+        stream.detach()
+        
+        # Nothing but events goes to stdout, so the output can be piped on
+        return 0
+    
+    count = export_events_file(db_manager, args.destination,
+                               fmt=args.format or format_for(args.destination))
+    if args.json:
+        print_json({'exported': count})
+    else:
+        print(f"Exported {count} events to {args.destination}")
+    return 0
+
+def cmd_purge(db_manager: DatabaseManager, args) -> int:
+    if args.before is None and not args.inactive:
+        raise ValueError("nothing to purge: pass --before DATE and/or --inactive")
+    
+    count = db_manager.purge_events(before=args.before, inactive=args.inactive,
+                                    dry_run=args.dry_run)
+    if args.json:
+        print_json({'purged': 0 if args.dry_run else count, 'matched': count,
+                    'dry_run': args.dry_run})
+    elif args.dry_run:
+        print(f"Would purge {count} events")
+    else:
+        print(f"Purged {count} events")
+    return 0
+
+def cmd_stats(db_manager: DatabaseManager, args) -> int:
+    stats = db_manager.get_event_stats()
+    event = db_manager.get_next_upcoming_event()
+    stats['next_event'] = event_json(event) if event else None
+    
+    if args.json:
+        print_json(stats)
+        return 0
+    
+    for key, value in stats.items():
+        if key != 'next_event':
+            print(f"{key.replace('_', ' ').capitalize():<24}{value}")
+    print(f"{'Next event':<24}"
+          + (f"{event['name']} ({event['event_date']})" if event else "none"))
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m countdown_cli",
+                                     description="Manage countdown events without the GUI")
+    parser.add_argument("--db", default=DATABASE_FILE, metavar="PATH",
+                        help=f"database file (default: {DATABASE_FILE})")
+    
+    # --json is accepted after any subcommand
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="machine-readable JSON output")
+    
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    
+    add = commands.add_parser("add", parents=[common], help="add an event")
+    add.add_argument("name")
+    add.add_argument("date", type=iso_date, help="YYYY-MM-DD")
+    add.add_argument("--description", default="")
+    add.add_argument("--priority", default="low",
+                     help="1-5 or " + "/".join(PRIORITY_BY_NAME) + " (default: low)")
+    add.add_argument("--days-before", type=int, default=1,
+                     help="notify this many days ahead (default: 1)")
+    add.add_argument("--no-notify", action="store_true", help="disable notifications")
+    add.add_argument("--color", help="theme color, e.g. #013220")
+    add.set_defaults(handler=cmd_add)
+    
+    listing = commands.add_parser("list", parents=[common], help="list events by date")
+    # Upcoming events are always active ones, so --all cannot apply to them
+    selection = listing.add_mutually_exclusive_group()
+    selection.add_argument("--all", action="store_true", help="include deleted events")
+    selection.add_argument("--upcoming", action="store_true",
+                           help="only active events from today, soonest and most important first")
+    listing.add_argument("--since", type=iso_date, metavar="DATE", help="events on or after DATE")
+    listing.add_argument("--until", type=iso_date, metavar="DATE", help="events on or before DATE")
+    listing.add_argument("--limit", type=int, default=0, help="at most this many events")
+    listing.set_defaults(handler=cmd_list)
+    
+    upcoming = commands.add_parser("next", parents=[common], help="show the next upcoming event")
+    upcoming.set_defaults(handler=cmd_next)
+    
+    bulk = commands.add_parser("bulk-import", parents=[common],
+                               help="import events from a file or stdin")
+    bulk.add_argument("source", nargs="?", default="-",
+                      help="file to read, or - for stdin (default)")
+    bulk.add_argument("--format", choices=STREAM_FORMATS,
+                      help=f"input format (default: from the extension, {DEFAULT_STREAM_FORMAT} for stdin)")
+    bulk.set_defaults(handler=cmd_bulk_import)
+    
+    export = commands.add_parser("export", parents=[common],
+                                 help="export active events to a file or stdout")
+    export.add_argument("destination", nargs="?", default="-",
+                        help="file to write, or - for stdout (default)")
+    export.add_argument("--format", choices=STREAM_FORMATS,
+                        help=f"output format (default: from the extension, {DEFAULT_STREAM_FORMAT} for stdout)")
+    export.set_defaults(handler=cmd_export)
+    
+    purge = commands.add_parser("purge", parents=[common], help="permanently delete events")
+    purge.add_argument("--before", type=iso_date, metavar="DATE",
+                       help="delete events dated before DATE")
+    purge.add_argument("--inactive", action="store_true", help="delete soft-deleted events")
+    purge.add_argument("--dry-run", action="store_true", help="only count what would be deleted")
+    purge.set_defaults(handler=cmd_purge)
+    
+    stats = commands.add_parser("stats", parents=[common], help="event and notification counts")
+    stats.set_defaults(handler=cmd_stats)
+    
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    db_manager = DatabaseManager(args.db)
+    try:
+        return args.handler(db_manager, args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly and keep
+        # the interpreter from failing again when it flushes stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        db_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
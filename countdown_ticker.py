@@ -0,0 +1,73 @@
+import math
+from datetime import datetime, time, timedelta
+from typing import Callable
+
+class CountdownTicker:
+    """Call back once per day (or minute/second) boundary using Tk's after().
+    
+    Nothing runs between boundaries: each tick schedules a single after()
+    for the exact time until the next local midnight (or minute/second).
+    """
+    
+    RESOLUTIONS = ("day", "minute", "second")
+    # Longer waits are split so a suspended machine or a clock change is
+    # noticed within the hour
+    MAX_DELAY_MS = 3600 * 1000
+    # Fire just after the boundary so datetime.now() is already past it
+    SLACK_MS = 50
+    
+    def __init__(self, widget, callback: Callable[[datetime], None], resolution: str = "day"):
+        if resolution not in self.RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {self.RESOLUTIONS}")
+        
+        self.widget = widget
+        self.callback = callback
+        self.resolution = resolution
+        self._period = None
+        self._after_id = None
+    
+    def start(self):
+        """Start ticking from the current period"""
+        if self._after_id is None:
+            self._period = self.period_start(datetime.now())
+            self._schedule()
+    
+    def stop(self):
+        """Cancel the pending tick"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def period_start(self, now: datetime) -> datetime:
+        """Start of the day/minute/second containing `now`"""
+        if self.resolution == "day":
+            return datetime.combine(now.date(), time.min)
+        if self.resolution == "minute":
+            return now.replace(second=0, microsecond=0)
+        return now.replace(microsecond=0)
+    
+    def next_boundary(self, now: datetime) -> datetime:
+        """Start of the period after the one containing `now`"""
+        step = {
+            "day": timedelta(days=1),
+            "minute": timedelta(minutes=1),
+            "second": timedelta(seconds=1)
+        }[self.resolution]
+        return self.period_start(now) + step
+    
+    def _schedule(self):
+        now = datetime.now()
+        delay_ms = math.ceil((self.next_boundary(now) - now).total_seconds() * 1000)
+        delay_ms = min(delay_ms + self.SLACK_MS, self.MAX_DELAY_MS)
+        self._after_id = self.widget.after(delay_ms, self._tick)
+    
+    def _tick(self):
+        now = datetime.now()
+        period = self.period_start(now)
+        try:
+            # Early or capped wake-ups land in the same period and do nothing
+            if period != self._period:
+                self._period = period
+                self.callback(now)
+        finally:
+            self._schedule()
@@ -1,154 +1,667 @@
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+
+from date_utils import parse_date, date_ordinal, days_until
 
 DATABASE_FILE = "countdown_events.db"
 
+# Pragmas applied to every pooled connection. WAL lets the UI, tray and
+# notification thread read while another thread writes; busy_timeout makes
+# writers wait for the lock instead of failing with "database is locked".
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+)
+
+EVENT_COLUMNS = """
+    id, name, description, event_date, created_at, updated_at,
+    is_active, notification_enabled, notification_days_before,
+    theme_color, priority
+"""
+
+# Bump SCHEMA_VERSION and add a step to _migrate() whenever the schema changes.
+# Existing countdown_events.db files are upgraded in place on startup.
+SCHEMA_VERSION = 3
+
+SCHEMA_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_events_active_date ON events (is_active, event_date)",
+    "CREATE INDEX IF NOT EXISTS idx_notifications_event_sent ON notifications (event_id, is_sent)",
+)
+
+# One ledger row per event, notification type and day
+DELIVERY_LEDGER_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_notifications_delivery "
+    "ON notifications (event_id, notification_type, notification_time)"
+)
+
+# Matches get_upcoming_events' ORDER BY (rowid breaks ties), so the next
+# event is the first index entry after today with no sort step
+UPCOMING_EVENTS_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_events_upcoming "
+    "ON events (is_active, event_date, priority DESC)"
+)
+
+# Hot queries checked by explain_query_plans(), mapped to the index each one
+# is expected to use ("a|b" when either index serves the query equally well).
+PLANNED_QUERIES = {
+    "active_events_by_date": (
+        "SELECT * FROM events WHERE is_active = 1 ORDER BY event_date ASC",
+        (),
+        "idx_events_active_date|idx_events_upcoming",
+    ),
+    "next_upcoming_event": (
+        "SELECT * FROM events WHERE is_active = 1 AND event_date >= ? "
+        "ORDER BY event_date ASC, priority DESC, id ASC LIMIT 1",
+        ("2025-01-01",),
+        "idx_events_upcoming",
+    ),
+    "notifications_for_event": (
+        "SELECT id FROM notifications WHERE event_id = ? AND is_sent = 0",
+        (1,),
+        "idx_notifications_event_sent",
+    ),
+    "notification_delivery": (
+        "SELECT is_sent FROM notifications WHERE event_id = ? AND notification_type = ? "
+        "AND notification_time = ?",
+        (1, "reminder", "2025-01-01"),
+        "idx_notifications_delivery",
+    ),
+    "setting_by_key": (
+        "SELECT value FROM settings WHERE key = ?",
+        ("current_theme",),
+        "sqlite_autoindex_settings_1",
+    ),
+    "settings_by_prefix": (
+        "SELECT key, value FROM settings WHERE key >= ? AND key < ? ORDER BY key",
+        ("custom_theme_", "custom_theme`"),
+        "sqlite_autoindex_settings_1",
+    ),
+}
+
+# Rows per transaction in bulk_add_events
+BULK_CHUNK_SIZE = 1000
+
+# Priority names accepted on import, matching PriorityColorManager's levels
+PRIORITY_BY_NAME = {"low": 1, "medium": 2, "high": 3, "critical": 4, "urgent": 5}
+
+# Spellings of true/false accepted for boolean fields in imported records
+FLAG_STRINGS = {"true": 1, "false": 0}
+
+_MISSING = object()
+
+def parse_flag(value) -> int:
+    """A boolean field as 0 or 1.
+    
+    Accepts a bool, the integers 0 and 1, or "true"/"false" in any case;
+    raises ValueError for anything else (so "no" or "0" strings are never
+    silently read as true).
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int) and value in (0, 1):
+        return value
+    if isinstance(value, str) and value.strip().lower() in FLAG_STRINGS:
+        return FLAG_STRINGS[value.strip().lower()]
+    raise ValueError(f"invalid flag '{value}' (expected true or false)")
+
+def event_values_from_record(record: Mapping) -> Tuple:
+    """Validate an imported event record and return its INSERT values.
+    
+    Accepts exported events as well as older layouts ('target_date', or the
+    original {"event": ..., "date": ...} file). Raises ValueError with a
+    readable message for records that cannot be imported.
+    """
+    if not isinstance(record, Mapping):
+        raise ValueError("record is not an object")
+    
+    name = record.get('name', record.get('event'))
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("missing event name")
+    
+    raw_date = record.get('event_date', record.get('target_date', record.get('date')))
+    if not isinstance(raw_date, str):
+        raise ValueError(f"missing event date for '{name}'")
+    try:
+        event_date = datetime.fromisoformat(raw_date).date().isoformat()
+    except ValueError:
+        raise ValueError(f"invalid event date '{raw_date}' for '{name}'") from None
+    
+    priority = record.get('priority', 1)
+    if isinstance(priority, str):
+        priority = PRIORITY_BY_NAME.get(priority.strip().lower(), priority)
+    try:
+        priority = int(priority)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid priority '{priority}' for '{name}'") from None
+    if not 1 <= priority <= 5:
+        raise ValueError(f"priority {priority} out of range 1-5 for '{name}'")
+    
+    days_before = record.get('notification_days_before', 1)
+    if isinstance(days_before, bool) or not isinstance(days_before, int) or days_before < 0:
+        raise ValueError(f"invalid notification_days_before '{days_before}' for '{name}'")
+    
+    notification_enabled = record.get('notification_enabled', True)
+    try:
+        notification_enabled = parse_flag(notification_enabled)
+    except ValueError:
+        raise ValueError(f"invalid notification_enabled '{notification_enabled}' for '{name}'") from None
+    
+    description = record.get('description') or ""
+    theme_color = record.get('theme_color') or "#013220"
+    
+    return (name.strip(), str(description), event_date, notification_enabled,
+            days_before, str(theme_color), priority)
+
+class Event(Mapping):
+    """Compact, slot-based record for one row of the events table.
+    
+    Behaves like the dicts the rest of the app has always used
+    (event['name'], event.get('priority'), event['days_remaining'] = n),
+    without a per-row __dict__ or hash table.
+    """
+    
+    FIELDS = (
+        'id', 'name', 'description', 'event_date', 'created_at', 'updated_at',
+        'is_active', 'notification_enabled', 'notification_days_before',
+        'theme_color', 'priority'
+    )
+    # Values the UI attaches to an event after loading it
+    EXTRA_FIELDS = ('days_remaining',)
+    
+    __slots__ = FIELDS + EXTRA_FIELDS + ('_ordinal',)
+    
+    _KEYS = frozenset(FIELDS + EXTRA_FIELDS)
+    
+    def __init__(self, id, name, description, event_date, created_at, updated_at,
+                 is_active, notification_enabled, notification_days_before,
+                 theme_color, priority):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.event_date = event_date
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.is_active = is_active
+        self.notification_enabled = notification_enabled
+        self.notification_days_before = notification_days_before
+        self.theme_color = theme_color
+        self.priority = priority
+    
+    @classmethod
+    def from_row(cls, cursor, row) -> "Event":
+        """sqlite3 row_factory for queries selecting EVENT_COLUMNS"""
+        return cls(*row)
+    
+    @property
+    def date(self) -> date:
+        """event_date as a date object (parsed once per distinct date string)"""
+        return parse_date(self.event_date)
+    
+    @property
+    def ordinal(self) -> int:
+        """event_date as a day ordinal, computed on first access"""
+        try:
+            return self._ordinal
+        except AttributeError:
+            self._ordinal = date_ordinal(self.event_date)
+            return self._ordinal
+    
+    def __getitem__(self, key):
+        if key in self._KEYS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        raise KeyError(key)
+    
+    def __setitem__(self, key, value):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        if key == 'event_date' and hasattr(self, '_ordinal'):
+            del self._ordinal
+        setattr(self, key, value)
+    
+    def __iter__(self):
+        for key in self.FIELDS:
+            yield key
+        for key in self.EXTRA_FIELDS:
+            if hasattr(self, key):
+                yield key
+    
+    def __len__(self):
+        return len(self.FIELDS) + sum(1 for key in self.EXTRA_FIELDS if hasattr(self, key))
+    
+    def copy(self) -> Dict:
+        """Plain dict copy, e.g. for JSON export"""
+        return dict(self.items())
+    
+    def __repr__(self):
+        return f"Event(id={self.id!r}, name={self.name!r}, event_date={self.event_date!r})"
+
+def event_json(event: Mapping) -> Dict:
+    """An event as a JSON-ready dict with days_remaining filled in (CLI and API output)"""
+    record = dict(event)
+    record['days_remaining'] = days_until(event['event_date'])
+    return record
+
 class DatabaseManager:
-    def __init__(self):
-        self.db_path = DATABASE_FILE
+    def __init__(self, db_path: str = DATABASE_FILE):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
+        # Row-level change notifications: listener(action, event_id) where action
+        # is "insert", "update" or "delete", or "reload" (event_id None) after a
+        # bulk change. change_counter grows on every write.
+        self._change_listeners = []
+        self.change_counter = 0
+        
+        # The settings table is small and read far more often than written:
+        # it is loaded into memory on first use and set_setting writes through
+        self._settings = None
+        self._settings_lock = threading.Lock()
+        
         self.init_database()
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the long-lived connection owned by the calling thread"""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.connection = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements in one transaction on this thread's connection.
+        
+        Commits on success and rolls back if the block raises. Nested use joins
+        the outer transaction.
+        """
+        conn = self._get_connection()
+        if conn.in_transaction:
+            yield conn.cursor()
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            # Cached settings may include writes that were just rolled back
+            self._settings = None
+            raise
+        else:
+            conn.commit()
+    
+    def close(self):
+        """Close every pooled connection"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+        self._local = threading.local()
+    
+    def release_connection(self):
+        """Close the calling thread's connection, if it has one.
+        
+        Short-lived worker threads call this when they finish so the pool
+        does not keep a connection (and its WAL file handles) per dead thread.
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            return
+        self._local.connection = None
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            pass
+    
+    def data_version(self) -> int:
+        """PRAGMA data_version of the calling thread's connection.
+        
+        Changes whenever another connection (another thread's, or another
+        process such as countdown_cli or api_server) commits to the database;
+        change listeners only hear about writes made through this object.
+        """
+        return self._get_connection().execute("PRAGMA data_version").fetchone()[0]
+    
+    def add_change_listener(self, listener: Callable[[str, Optional[int]], None]):
+        """Register a callback for committed event changes.
+        
+        Listeners run on the thread that made the change.
+        """
+        self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener: Callable[[str, Optional[int]], None]):
+        """Unregister a change callback"""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+    
+    def _emit_change(self, action: str, event_id: Optional[int]):
+        """Bump the change counter and notify listeners of a committed change"""
+        self.change_counter += 1
+        for listener in tuple(self._change_listeners):
+            try:
+                listener(action, event_id)
+            except Exception as e:
+                print(f"Error in database change listener: {e}")
+    
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create events table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                event_date DATE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_active INTEGER DEFAULT 1,
-                notification_enabled INTEGER DEFAULT 1,
-                notification_days_before INTEGER DEFAULT 1,
-                theme_color TEXT DEFAULT '#013220',
-                priority INTEGER DEFAULT 1
-            )
-        ''')
-        
-        # Create notifications table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notifications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_id INTEGER,
-                notification_type TEXT,
-                notification_time TIMESTAMP,
-                is_sent INTEGER DEFAULT 0,
-                FOREIGN KEY (event_id) REFERENCES events (id)
-            )
-        ''')
-        
-        # Create settings table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as cursor:
+            # Create events table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    description TEXT,
+                    event_date DATE NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    is_active INTEGER DEFAULT 1,
+                    notification_enabled INTEGER DEFAULT 1,
+                    notification_days_before INTEGER DEFAULT 1,
+                    theme_color TEXT DEFAULT '#013220',
+                    priority INTEGER DEFAULT 1
+                )
+            ''')
+            
+            # Create notifications table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS notifications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id INTEGER,
+                    notification_type TEXT,
+                    notification_time TIMESTAMP,
+                    is_sent INTEGER DEFAULT 0,
+                    FOREIGN KEY (event_id) REFERENCES events (id)
+                )
+            ''')
+            
+            # Create settings table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            
+            self._migrate(cursor)
+    
+    def _migrate(self, cursor):
+        """Upgrade an existing database to SCHEMA_VERSION"""
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        
+        if version < 1:
+            # Version 1: indexes for the active-events list and notification lookups
+            for statement in SCHEMA_INDEXES:
+                cursor.execute(statement)
+            cursor.execute("ANALYZE")
+        
+        if version < 2:
+            # Version 2: the notifications table becomes a delivery ledger
+            cursor.execute('''
+                DELETE FROM notifications WHERE id NOT IN (
+                    SELECT MIN(id) FROM notifications
+                    GROUP BY event_id, notification_type, notification_time
+                )
+            ''')
+            cursor.execute(DELIVERY_LEDGER_INDEX)
+        
+        if version < 3:
+            # Version 3: ordered index for the next-upcoming-event lookup
+            cursor.execute(UPCOMING_EVENTS_INDEX)
+            cursor.execute("ANALYZE")
+        
+        if version != SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def explain_query_plans(self) -> Dict[str, Dict]:
+        """Run EXPLAIN QUERY PLAN on the hot queries and check their indexes are used"""
+        conn = self._get_connection()
+        report = {}
+        
+        for name, (query, params, expected_index) in PLANNED_QUERIES.items():
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            details = [row[-1] for row in rows]
+            report[name] = {
+                'query': query,
+                'plan': details,
+                'expected_index': expected_index,
+                'uses_index': any(index in detail for detail in details
+                                  for index in expected_index.split("|")),
+                'temp_sort': any("TEMP B-TREE" in detail for detail in details)
+            }
+        
+        return report
     
     def add_event(self, name: str, event_date: str, description: str = "", 
                   notification_enabled: bool = True, notification_days_before: int = 1,
                   theme_color: str = "#013220", priority: int = 1) -> int:
         """Add a new event to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO events (name, description, event_date, notification_enabled, 
-                              notification_days_before, theme_color, priority)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (name, description, event_date, notification_enabled, 
-              notification_days_before, theme_color, priority))
-        
-        event_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO events (name, description, event_date, notification_enabled, 
+                                  notification_days_before, theme_color, priority)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (name, description, event_date, notification_enabled, 
+                  notification_days_before, theme_color, priority))
+            
+            event_id = cursor.lastrowid
+        
+        self._emit_change("insert", event_id)
         return event_id
     
-    def get_all_events(self, active_only: bool = True) -> List[Dict]:
-        """Get all events from the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def add_event_from_record(self, record: Mapping) -> int:
+        """Validate one event record (see event_values_from_record) and add it.
         
-        query = '''
-            SELECT id, name, description, event_date, created_at, updated_at,
-                   is_active, notification_enabled, notification_days_before,
-                   theme_color, priority
-            FROM events
-        '''
+        Raises ValueError, before anything is written, if the record is invalid.
+        """
+        (name, description, event_date, notification_enabled,
+         days_before, theme_color, priority) = event_values_from_record(record)
+        return self.add_event(
+            name, event_date, description,
+            notification_enabled=bool(notification_enabled),
+            notification_days_before=days_before,
+            theme_color=theme_color,
+            priority=priority
+        )
+    
+    def bulk_add_events(self, records, chunk_size: int = BULK_CHUNK_SIZE,
+                        progress: Callable[[int], None] = None) -> Tuple[int, List[Tuple[int, str]]]:
+        """Validate and insert many event records in chunked transactions.
+        
+        `records` may be any iterable of mappings (see event_values_from_record).
+        Returns (inserted count, [(record index, error message), ...]) for the
+        records that were skipped. Listeners get a single "reload" change.
+        
+        progress(records read) is called after each committed chunk; if it
+        raises, the import stops there and the committed chunks are kept.
+        """
+        inserted = 0
+        errors = []
+        chunk = []
+        index = -1
+        
+        try:
+            for index, record in enumerate(records):
+                try:
+                    chunk.append(event_values_from_record(record))
+                except ValueError as e:
+                    errors.append((index, str(e)))
+                    continue
+                
+                if len(chunk) >= chunk_size:
+                    inserted += self._insert_event_rows(chunk)
+                    chunk = []
+                    if progress:
+                        progress(index + 1)
+            
+            if chunk:
+                inserted += self._insert_event_rows(chunk)
+            if progress:
+                progress(index + 1)
+        finally:
+            # Earlier chunks are committed even if a later one fails
+            if inserted:
+                self._emit_change("reload", None)
+        
+        return inserted, errors
+    
+    def _insert_event_rows(self, rows: List[Tuple]) -> int:
+        """Insert validated event rows in one transaction"""
+        with self.transaction() as cursor:
+            cursor.executemany('''
+                INSERT INTO events (name, description, event_date, notification_enabled, 
+                                  notification_days_before, theme_color, priority)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        return len(rows)
+    
+    def get_all_events(self, active_only: bool = True) -> List[Event]:
+        """Get all events from the database"""
+        query = f"SELECT {EVENT_COLUMNS} FROM events"
         
         if active_only:
             query += " WHERE is_active = 1"
         
         query += " ORDER BY event_date ASC"
         
+        return self._fetch_events(query)
+    
+    def iter_events(self, active_only: bool = True, chunk_size: int = BULK_CHUNK_SIZE) -> Iterator[Event]:
+        """Yield events in get_all_events order, fetching chunk_size rows at a time.
+        
+        Only one chunk is held in memory. The read runs on this thread's
+        connection, so consume the iterator on the thread that created it.
+        """
+        query = f"SELECT {EVENT_COLUMNS} FROM events"
+        if active_only:
+            query += " WHERE is_active = 1"
+        query += " ORDER BY event_date ASC"
+        
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = Event.from_row
         cursor.execute(query)
-        rows = cursor.fetchall()
-        
-        events = []
-        for row in rows:
-            events.append({
-                'id': row[0],
-                'name': row[1],
-                'description': row[2],
-                'event_date': row[3],
-                'created_at': row[4],
-                'updated_at': row[5],
-                'is_active': row[6],
-                'notification_enabled': row[7],
-                'notification_days_before': row[8],
-                'theme_color': row[9],
-                'priority': row[10]
-            })
-        
-        conn.close()
-        return events
-    
-    def get_event_by_id(self, event_id: int) -> Optional[Dict]:
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def count_events(self, active_only: bool = True) -> int:
+        """Number of (active) events"""
+        query = "SELECT COUNT(*) FROM events"
+        if active_only:
+            query += " WHERE is_active = 1"
+        return self._get_connection().execute(query).fetchone()[0]
+    
+    def get_event_by_id(self, event_id: int) -> Optional[Event]:
         """Get a specific event by ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, name, description, event_date, created_at, updated_at,
-                   is_active, notification_enabled, notification_days_before,
-                   theme_color, priority
-            FROM events WHERE id = ?
-        ''', (event_id,))
-        
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return {
-                'id': row[0],
-                'name': row[1],
-                'description': row[2],
-                'event_date': row[3],
-                'created_at': row[4],
-                'updated_at': row[5],
-                'is_active': row[6],
-                'notification_enabled': row[7],
-                'notification_days_before': row[8],
-                'theme_color': row[9],
-                'priority': row[10]
-            }
-        return None
+        events = self._fetch_events(f"SELECT {EVENT_COLUMNS} FROM events WHERE id = ?", (event_id,))
+        return events[0] if events else None
+    
+    def get_events_between(self, start_date: str, end_date: str,
+                           active_only: bool = True) -> List[Event]:
+        """Get events dated from start_date to end_date inclusive (YYYY-MM-DD)"""
+        query = f"SELECT {EVENT_COLUMNS} FROM events WHERE event_date BETWEEN ? AND ?"
+        
+        if active_only:
+            query += " AND is_active = 1"
+        
+        query += " ORDER BY event_date ASC, id ASC"
+        
+        return self._fetch_events(query, (start_date, end_date))
+    
+    def get_upcoming_events(self, limit: int = 10, from_date: str = None) -> List[Event]:
+        """Get the next active events on or after from_date (default today).
+        
+        Ordered the way the UI ranks them: soonest first, then highest priority.
+        """
+        if from_date is None:
+            from_date = datetime.now().date().isoformat()
+        
+        return self._fetch_events(f'''
+            SELECT {EVENT_COLUMNS} FROM events
+            WHERE is_active = 1 AND event_date >= ?
+            ORDER BY event_date ASC, priority DESC, id ASC
+            LIMIT ?
+        ''', (from_date, limit))
+    
+    def get_next_upcoming_event(self) -> Optional[Event]:
+        """The first of get_upcoming_events for today, or None.
+        
+        A single idx_events_upcoming lookup (LIMIT 1, no sort), cheap enough
+        to run on every call. It is not cached: writes from other connections
+        and processes would leave a cached answer stale.
+        """
+        events = self.get_upcoming_events(limit=1)
+        return events[0] if events else None
+    
+    def get_events_page(self, after: Optional[Tuple[str, int]] = None,
+                        limit: int = 100) -> List[Event]:
+        """Get one page of active events using keyset pagination.
+        
+        Pass the (event_date, id) of the last event of the previous page as
+        `after` to fetch the next page; each page is an index range scan, so
+        deep pages cost the same as the first one.
+        """
+        if after is None:
+            return self._fetch_events(f'''
+                SELECT {EVENT_COLUMNS} FROM events
+                WHERE is_active = 1
+                ORDER BY event_date ASC, id ASC
+                LIMIT ?
+            ''', (limit,))
+        
+        last_date, last_id = after
+        return self._fetch_events(f'''
+            SELECT {EVENT_COLUMNS} FROM events
+            WHERE is_active = 1 AND (event_date, id) > (?, ?)
+            ORDER BY event_date ASC, id ASC
+            LIMIT ?
+        ''', (last_date, last_id, limit))
+    
+    def get_max_notification_days_before(self) -> int:
+        """Get the longest reminder lead time of any active event"""
+        conn = self._get_connection()
+        row = conn.execute('''
+            SELECT MAX(notification_days_before) FROM events
+            WHERE is_active = 1 AND notification_enabled = 1
+        ''').fetchone()
+        return row[0] or 0
+    
+    def _fetch_events(self, query: str, params: tuple = ()) -> List[Event]:
+        """Run an events query selecting EVENT_COLUMNS and return Event records"""
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = Event.from_row
+        return cursor.execute(query, params).fetchall()
     
     def update_event(self, event_id: int, **kwargs) -> bool:
         """Update an event"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Build dynamic update query
         update_fields = []
         values = []
@@ -160,7 +673,6 @@ class DatabaseManager:
                 values.append(value)
         
         if not update_fields:
-            conn.close()
             return False
         
         # Add updated_at timestamp
@@ -168,12 +680,13 @@ class DatabaseManager:
         values.append(event_id)
         
         query = f"UPDATE events SET {', '.join(update_fields)} WHERE id = ?"
-        cursor.execute(query, values)
-        
-        rows_affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with self.transaction() as cursor:
+            cursor.execute(query, values)
+            rows_affected = cursor.rowcount
         
+        if rows_affected > 0:
+            # Soft-deleted events leave every active view, so report them as deletes
+            self._emit_change("delete" if kwargs.get('is_active') == 0 else "update", event_id)
         return rows_affected > 0
     
     def delete_event(self, event_id: int) -> bool:
@@ -182,45 +695,195 @@ class DatabaseManager:
     
     def hard_delete_event(self, event_id: int) -> bool:
         """Permanently delete an event"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.transaction() as cursor:
+            # Delete associated notifications first
+            cursor.execute("DELETE FROM notifications WHERE event_id = ?", (event_id,))
+            
+            # Delete the event
+            cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
+            
+            rows_affected = cursor.rowcount
         
-        # Delete associated notifications first
-        cursor.execute("DELETE FROM notifications WHERE event_id = ?", (event_id,))
+        if rows_affected > 0:
+            self._emit_change("delete", event_id)
+        return rows_affected > 0
+    
+    def purge_events(self, before: str = None, inactive: bool = True, dry_run: bool = False) -> int:
+        """Permanently delete soft-deleted events and/or events dated before `before`.
         
-        # Delete the event
-        cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
+        Returns the number of events removed (or that would be, with dry_run).
+        Their notification ledger rows go in the same transaction, and
+        listeners get a single "reload" change.
+        """
+        conditions = []
+        params = []
+        if inactive:
+            conditions.append("is_active = 0")
+        if before is not None:
+            conditions.append("event_date < ?")
+            params.append(before)
+        if not conditions:
+            return 0
+        where = " OR ".join(conditions)
         
-        rows_affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        if dry_run:
+            conn = self._get_connection()
+            return conn.execute(f"SELECT COUNT(*) FROM events WHERE {where}", params).fetchone()[0]
         
-        return rows_affected > 0
+        with self.transaction() as cursor:
+            cursor.execute(f'''
+                DELETE FROM notifications
+                WHERE event_id IN (SELECT id FROM events WHERE {where})
+            ''', params)
+            cursor.execute(f"DELETE FROM events WHERE {where}", params)
+            deleted = cursor.rowcount
+        
+        if deleted:
+            self._emit_change("reload", None)
+        return deleted
     
-    def get_setting(self, key: str, default_value: str = None) -> str:
-        """Get a setting value"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_event_stats(self, today: str = None) -> Dict[str, int]:
+        """Event counts by state in a single scan of the events table"""
+        if today is None:
+            today = datetime.now().date().isoformat()
+        
+        conn = self._get_connection()
+        total, active, upcoming = conn.execute('''
+            SELECT COUNT(*),
+                   COALESCE(SUM(is_active = 1), 0),
+                   COALESCE(SUM(is_active = 1 AND event_date >= ?), 0)
+            FROM events
+        ''', (today,)).fetchone()
+        pending, sent = conn.execute('''
+            SELECT COALESCE(SUM(is_sent = 0), 0), COALESCE(SUM(is_sent = 1), 0)
+            FROM notifications
+        ''').fetchone()
         
-        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        result = cursor.fetchone()
+        return {
+            'total': total,
+            'active': active,
+            'inactive': total - active,
+            'upcoming': upcoming,
+            'past': active - upcoming,
+            'notifications_pending': pending,
+            'notifications_sent': sent,
+        }
+    
+    def record_scheduled_notifications(self, entries: List[Tuple[int, str, str]]):
+        """Add pending ledger rows for (event_id, notification_type, day) entries not yet recorded.
+        
+        The scheduler records only what falls due by its horizon;
+        claim_notification adds the row itself if it is missing.
+        """
+        if not entries:
+            return
+        
+        with self.transaction() as cursor:
+            cursor.executemany('''
+                INSERT OR IGNORE INTO notifications
+                    (event_id, notification_type, notification_time, is_sent)
+                VALUES (?, ?, ?, 0)
+            ''', entries)
+    
+    def claim_notification(self, event_id: int, notification_type: str, day: str) -> bool:
+        """Mark a notification as sent; returns False if it was already sent.
         
-        conn.close()
+        Claiming before showing the popup means a restart or retry never
+        delivers the same reminder twice.
+        """
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT OR IGNORE INTO notifications
+                    (event_id, notification_type, notification_time, is_sent)
+                VALUES (?, ?, ?, 0)
+            ''', (event_id, notification_type, day))
+            cursor.execute('''
+                UPDATE notifications SET is_sent = 1
+                WHERE event_id = ? AND notification_type = ? AND notification_time = ?
+                  AND is_sent = 0
+            ''', (event_id, notification_type, day))
+            claimed = cursor.rowcount == 1
         
-        if result:
-            return result[0]
-        return default_value
+        return claimed
+    
+    def get_sent_notifications(self, since: str) -> set:
+        """Get (event_id, notification_type, day) for everything delivered on or after since"""
+        conn = self._get_connection()
+        rows = conn.execute('''
+            SELECT event_id, notification_type, notification_time FROM notifications
+            WHERE is_sent = 1 AND notification_time >= ?
+        ''', (since,)).fetchall()
+        return set(rows)
+    
+    def prune_notifications(self, before: str) -> int:
+        """Delete ledger rows for days before the given date"""
+        with self.transaction() as cursor:
+            cursor.execute("DELETE FROM notifications WHERE notification_time < ?", (before,))
+            deleted = cursor.rowcount
+        
+        return deleted
+    
+    def _load_settings(self) -> Dict[str, str]:
+        """The settings table as a dict, read from disk only the first time"""
+        settings = self._settings
+        if settings is None:
+            with self._settings_lock:
+                if self._settings is None:
+                    conn = self._get_connection()
+                    self._settings = dict(conn.execute("SELECT key, value FROM settings"))
+                settings = self._settings
+        return settings
+    
+    def get_setting(self, key: str, default_value: str = None) -> str:
+        """Get a setting value"""
+        return self._load_settings().get(key, default_value)
+    
+    def get_settings_with_prefix(self, prefix: str) -> List[Tuple[str, str]]:
+        """(key, value) for every setting whose key starts with prefix, in key order.
+        
+        Runs as a range scan over the settings primary key rather than a
+        LIKE, so it reads only the matching rows.
+        """
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        conn = self._get_connection()
+        return conn.execute(
+            "SELECT key, value FROM settings WHERE key >= ? AND key < ? ORDER BY key",
+            (prefix, upper)
+        ).fetchall()
     
     def set_setting(self, key: str, value: str) -> bool:
         """Set a setting value"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO settings (key, value)
-            VALUES (?, ?)
-        ''', (key, value))
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT OR REPLACE INTO settings (key, value)
+                VALUES (?, ?)
+            ''', (key, value))
         
-        conn.commit()
-        conn.close()
+        # Cache the value only once it has been committed
+        self._load_settings()[key] = value
         return True
+
+
+def print_diagnostics(db_path: str = DATABASE_FILE) -> bool:
+    """Print the query plan self-check; returns False if any query misses its index"""
+    db_manager = DatabaseManager(db_path)
+    healthy = True
+    
+    try:
+        for name, result in db_manager.explain_query_plans().items():
+            ok = result['uses_index'] and not result['temp_sort']
+            healthy = healthy and ok
+            print(f"[{'OK' if ok else 'FAIL'}] {name} (expects {result['expected_index']})")
+            for detail in result['plan']:
+                print(f"    {detail}")
+    finally:
+        db_manager.close()
+    
+    return healthy
+
+if __name__ == "__main__":
+    import sys
+    
+    if "--diagnostics" in sys.argv[1:]:
+        sys.exit(0 if print_diagnostics() else 1)
+    print("Usage: python database.py --diagnostics")
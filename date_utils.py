@@ -0,0 +1,40 @@
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# Distinct event dates stay in the low thousands (about 365 per year of events)
+DATE_CACHE_SIZE = 8192
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD event_date, memoized; equal strings share one date object"""
+    return date.fromisoformat(value)
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def date_ordinal(value: str) -> int:
+    """Proleptic Gregorian ordinal of a YYYY-MM-DD string"""
+    return parse_date(value).toordinal()
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_long_date(value: str) -> str:
+    """YYYY-MM-DD as shown on event cards, e.g. 'March 05, 2026'"""
+    return parse_date(value).strftime("%B %d, %Y")
+
+# Today's ordinal and the epoch-second range [start, end) it is valid for
+_today = (0, 0.0, 0.0)
+
+def today_ordinal() -> int:
+    """date.today().toordinal(), recomputed only when the local date changes"""
+    global _today
+    ordinal, start, end = _today
+    now = time.time()
+    if not start <= now < end:
+        today = date.today()
+        midnight = datetime.combine(today, datetime.min.time())
+        ordinal = today.toordinal()
+        _today = (ordinal, midnight.timestamp(), (midnight + timedelta(days=1)).timestamp())
+    return ordinal
+
+def days_until(value: str, today: int = None) -> int:
+    """Days from today (or the given ordinal) to a YYYY-MM-DD date; negative if past"""
+    return date_ordinal(value) - (today_ordinal() if today is None else today)
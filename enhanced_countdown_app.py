@@ -1,15 +1,30 @@
+import sys
+
+from single_instance import SingleInstance, CONNECT_TIMEOUT, forward_launch, launch_command
+
+# A second launch hands its command to the running instance and exits
+# before the GUI toolkits are imported
+if __name__ == "__main__" and forward_launch(sys.argv[1:]):
+    sys.exit(0)
+
 import customtkinter as ctk
 from tkinter import messagebox, ttk
 from datetime import datetime, timedelta
 import threading
-import sys
+import queue
 import os
 
 # Import our custom modules
 from database import DatabaseManager
 from notifications import NotificationManager, CustomNotificationDialog
 from system_tray import SystemTrayManager, TrayNotificationManager
-from theme_manager import ThemeManager, PriorityColorManager
+from theme_manager import ThemeManager, ThemedWidgets, PriorityColorManager
+from event_list import VirtualEventList, event_sort_key
+from startup_profiler import StartupProfiler, PROFILE_FLAG, run_profiled
+from countdown_ticker import CountdownTicker
+from date_utils import days_until, today_ordinal
+from background_task import BackgroundTask
+from event_io import FILE_TYPES, export_events_file, import_events_file
 
 # Set dark appearance mode for modern look
 ctk.set_appearance_mode("dark")
@@ -33,6 +48,32 @@ COLORS = {
     "hover": "#334155"          # Hover state
 }
 
+# Delay after the main window is first drawn before the tray icon and
+# notification monitor are started
+BACKGROUND_SERVICES_DELAY_MS = 300
+
+# How often (ms) the Tk thread runs UI work queued by worker and IPC threads
+UI_QUEUE_POLL_MS = 100
+
+def countdown_display(days_remaining: int, priority: int) -> dict:
+    """Big countdown text, subtitle and colors for the detail panel"""
+    # Get priority color
+    priority_color = PriorityColorManager.get_days_remaining_color(days_remaining, priority)
+    
+    if days_remaining > 0:
+        text, subtitle, color = f"⏰ {days_remaining}", "days remaining", priority_color
+    elif days_remaining == 0:
+        text, subtitle, color = "🎉 TODAY", "is the day!", "#dc3545"
+    else:
+        text, subtitle, color = f"📅 {abs(days_remaining)}", "days ago", "#6c757d"
+    
+    return {
+        'text': text,
+        'subtitle': subtitle,
+        'color': color,
+        'priority_color': priority_color
+    }
+
 def center_window(window, width: int, height: int):
     """Center a window on the screen with proper positioning"""
     window.update_idletasks()
@@ -43,15 +84,24 @@ def center_window(window, width: int, height: int):
     window.geometry(f"{width}x{height}+{x}+{y}")
 
 class CountdownApp:
-    def __init__(self):
-        self.db_manager = DatabaseManager()
-        self.theme_manager = ThemeManager(self.db_manager)
+    def __init__(self, profiler: StartupProfiler = None, instance: SingleInstance = None,
+                 launch: tuple = ("show", {})):
+        self.profiler = profiler or StartupProfiler()
+        self.instance = instance
+        
+        with self.profiler.phase("database"):
+            self.db_manager = DatabaseManager()
+        with self.profiler.phase("themes"):
+            self.theme_manager = ThemeManager(self.db_manager)
+            # Widgets colored from the theme, re-styled in place by apply_theme
+            self.themed_widgets = ThemedWidgets(self.theme_manager.styles)
         self.notification_manager = NotificationManager(self.db_manager)
+        self.db_manager.add_change_listener(self._on_events_changed)
         
-        # Initialize system tray
+        # Initialize system tray (its menu callbacks run on the tray's thread)
         self.tray_manager = SystemTrayManager(
-            app_callback=self.show_main_window,
-            quit_callback=self.quit_application
+            app_callback=lambda: self.call_on_tk_thread(self.show_main_window),
+            quit_callback=lambda: self.call_on_tk_thread(self.quit_application)
         )
         self.tray_notification_manager = TrayNotificationManager(self.tray_manager)
         
@@ -59,17 +109,95 @@ class CountdownApp:
         self.root = None
         self.current_events = []
         self.selected_event_id = None
-        
-        # Start background services
-        self.notification_manager.start_monitoring()
-        self.tray_manager.start()
-        
-        # Check if this is first run
-        if not self.db_manager.get_all_events():
+        self.countdown_view = None
+        self.day_ticker = None
+        self.services_started = False
+        # (callback, args) from other threads; Tk may only be used on its own thread
+        self._ui_calls = queue.SimpleQueue()
+        
+        # Commands from later launches; an event passed to this launch is added first
+        command, payload = launch
+        if command == "add":
+            try:
+                self.handle_instance_command(command, payload)
+            except ValueError as e:
+                print(f"Could not add event: {e}", file=sys.stderr)
+        if self.instance:
+            self.instance.listen(self.handle_instance_command)
+        
+        # Check if this is first run. The tray icon and notification monitor
+        # are started by the first window once it has been drawn.
+        if not self.db_manager.get_events_page(limit=1):
             self.show_welcome_dialog()
         else:
             self.show_main_window()
     
+    def handle_instance_command(self, command: str, payload: dict):
+        """Run a command forwarded by another launch (called on the IPC thread)"""
+        if command == "add":
+            # The change listener refreshes the window on the Tk thread
+            return self.db_manager.add_event_from_record(payload)
+        if command == "show":
+            # Runs once the main window exists (it stays queued while the
+            # welcome window is open)
+            self.call_on_tk_thread(self.show_main_window)
+            return None
+        raise ValueError(f"unknown command '{command}'")
+    
+    def call_on_tk_thread(self, callback, *args):
+        """Run callback(*args) on the Tk thread; safe to call from any thread"""
+        self._ui_calls.put((callback, args))
+    
+    def _drain_ui_calls(self):
+        """Run the UI calls queued by other threads, then poll again"""
+        while True:
+            try:
+                callback, args = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in queued UI update: {e}")
+        self.root.after(UI_QUEUE_POLL_MS, self._drain_ui_calls)
+    
+    def start_background_services(self):
+        """Start notification monitoring and the tray icon (once, after first paint)"""
+        if self.services_started:
+            return
+        self.services_started = True
+        
+        with self.profiler.phase("notification monitor"):
+            self.notification_manager.start_monitoring()
+        with self.profiler.phase("system tray"):
+            self.tray_manager.start()
+            self.refresh_tray()
+        self.profiler.mark("background services started")
+        
+        if self.profiler.enabled:
+            self.profiler.report()
+            self.quit_application()
+    
+    def refresh_tray(self):
+        """Show the next upcoming event on the tray icon and tooltip"""
+        next_event = self.get_next_upcoming_event()
+        if next_event:
+            self.tray_manager.update_icon_with_countdown(next_event['days_remaining'])
+            self.tray_notification_manager.update_tray_tooltip({
+                'name': next_event['name'],
+                'days': next_event['days_remaining']
+            })
+        else:
+            self.tray_notification_manager.update_tray_tooltip(None)
+    
+    def _schedule_background_services(self, window):
+        """Defer background services until the window is on screen"""
+        def on_first_paint():
+            self.profiler.mark("first paint")
+            window.after(BACKGROUND_SERVICES_DELAY_MS, self.start_background_services)
+        
+        window.after_idle(on_first_paint)
+    
     def show_welcome_dialog(self):
         """Show welcome dialog for first-time users"""
         welcome = ctk.CTk()
@@ -198,36 +326,47 @@ class CountdownApp:
         )
         explore_btn.pack(side="left", padx=10)
         
+        self._schedule_background_services(welcome)
         welcome.mainloop()
     
     def show_main_window(self):
         """Show the main application window"""
         if self.root:
+            # Also brings the window back after minimize_to_tray
+            self.root.deiconify()
             self.root.lift()
             self.root.focus_force()
             return
         
-        self.root = ctk.CTk()
-        self.root.title("Countdown Pro")
-        center_window(self.root, 950, 700)
-        self.root.configure(fg_color=COLORS["primary"])
-        self.root.minsize(850, 650)
-        
-        # Apply theme
-        self.apply_theme()
-        
-        # Create menu bar
-        self.create_menu_bar()
-        
-        # Create main layout
-        self.create_main_layout()
+        with self.profiler.phase("main window"):
+            self.root = ctk.CTk()
+            self.root.title("Countdown Pro")
+            center_window(self.root, 950, 700)
+            self.root.configure(fg_color=COLORS["primary"])
+            self.root.minsize(850, 650)
+            
+            # Apply theme
+            self.apply_theme()
+            
+            # Create menu bar
+            self.create_menu_bar()
+            
+            # Create main layout
+            self.create_main_layout()
         
         # Load and display events
-        self.refresh_events()
+        with self.profiler.phase("load events"):
+            self.refresh_events()
+        
+        # Keep day counts current across midnight without periodic refreshes
+        self.day_ticker = CountdownTicker(self.root, self._on_day_changed)
+        self.day_ticker.start()
         
         # Bind close event to minimize to tray instead of closing
         self.root.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
         
+        self._schedule_background_services(self.root)
+        self.root.after(UI_QUEUE_POLL_MS, self._drain_ui_calls)
         self.root.mainloop()
     
     def create_menu_bar(self):
@@ -403,16 +542,15 @@ class CountdownApp:
         )
         list_header.pack(pady=18)
         
-        # Event list scrollable frame with modern scrollbar
-        self.events_scrollable = ctk.CTkScrollableFrame(
-            left_panel, 
-            corner_radius=12,
-            fg_color="transparent",
-            scrollbar_fg_color=COLORS["secondary"],
-            scrollbar_button_color=COLORS["accent"],
-            scrollbar_button_hover_color=COLORS["accent_hover"]
+        # Virtualized event list: only the visible cards exist and are recycled on scroll
+        self.event_list = VirtualEventList(
+            left_panel,
+            colors=COLORS,
+            on_select=self.select_event,
+            empty_text_color=self.theme_manager.styles["text"]["text_color"]
         )
-        self.events_scrollable.pack(fill="both", expand=True, padx=10, pady=(0, 15))
+        self.themed_widgets.add(self.event_list.empty_label, "text")
+        self.event_list.pack(fill="both", expand=True, padx=10, pady=(0, 15))
         
         # Right panel - Event details and countdown with elegant design
         right_panel = ctk.CTkFrame(
@@ -460,7 +598,7 @@ class CountdownApp:
         for widget in self.countdown_frame.winfo_children():
             widget.destroy()
         
-        events = self.db_manager.get_all_events()
+        events = self.current_events
         
         # Create main container with modern design
         main_container = ctk.CTkFrame(
@@ -522,10 +660,10 @@ class CountdownApp:
                 border_width=0
             )
             cta_button.pack(pady=(0, 60))
-            
+        
         else:
             # Show next upcoming event with premium styling
-            next_event = self.get_next_upcoming_event(events)
+            next_event = self.get_next_upcoming_event()
             if next_event:
                 # Professional header section
                 header_frame = ctk.CTkFrame(
@@ -539,11 +677,11 @@ class CountdownApp:
                 header_frame.pack(fill="x", padx=15, pady=(15, 20))
                 header_frame.pack_propagate(False)
                 
-                header_label = ctk.CTkLabel(
+                header_label = self.themed_widgets.create(
+                    ctk.CTkLabel, "accent_text",
                     header_frame,
                     text="🔥 Next Upcoming Event",
-                    font=("Segoe UI", 18, "bold"),
-                    text_color=self.theme_manager.current_theme["accent_color"]
+                    font=("Segoe UI", 18, "bold")
                 )
                 header_label.pack(expand=True)
                 
@@ -561,19 +699,19 @@ class CountdownApp:
                 )
                 icon_label.pack(pady=(40, 20))
                 
-                title_label = ctk.CTkLabel(
+                title_label = self.themed_widgets.create(
+                    ctk.CTkLabel, "accent_text",
                     past_frame,
                     text="All Events Complete!",
-                    font=("Segoe UI", 24, "bold"),
-                    text_color=self.theme_manager.current_theme["accent_color"]
+                    font=("Segoe UI", 24, "bold")
                 )
                 title_label.pack(pady=(0, 10))
                 
-                desc_label = ctk.CTkLabel(
+                desc_label = self.themed_widgets.create(
+                    ctk.CTkLabel, "text",
                     past_frame,
                     text="Great job! You've completed all your events.\nAdd new events to continue tracking countdowns.",
                     font=("Segoe UI", 14),
-                    text_color=self.theme_manager.current_theme["text_color"],
                     justify="center"
                 )
                 desc_label.pack(pady=(0, 30))
@@ -592,25 +730,14 @@ class CountdownApp:
                 )
                 new_event_btn.pack(pady=(0, 40))
     
-    def get_next_upcoming_event(self, events):
+    def get_next_upcoming_event(self):
         """Get the next upcoming event"""
-        today = datetime.now().date()
-        upcoming_events = []
+        event = self.db_manager.get_next_upcoming_event()
         
-        for event in events:
-            event_date = datetime.strptime(event['event_date'], "%Y-%m-%d").date()
-            days_remaining = (event_date - today).days
-            
-            if days_remaining >= 0:
-                event['days_remaining'] = days_remaining
-                upcoming_events.append(event)
-        
-        if upcoming_events:
-            # Sort by days remaining, then by priority
-            upcoming_events.sort(key=lambda x: (x['days_remaining'], -x['priority']))
-            return upcoming_events[0]
+        if event:
+            event['days_remaining'] = event.ordinal - today_ordinal()
         
-        return None
+        return event
     
     def show_event_countdown(self, event):
         """Show countdown for a specific event"""
@@ -618,14 +745,8 @@ class CountdownApp:
             widget.destroy()
         
         # Calculate days remaining
-        today = datetime.now().date()
-        event_date = datetime.strptime(event['event_date'], "%Y-%m-%d").date()
-        days_remaining = (event_date - today).days
-        
-        # Get priority color
-        priority_color = PriorityColorManager.get_days_remaining_color(
-            days_remaining, event['priority']
-        )
+        days_remaining = days_until(event['event_date'])
+        countdown = countdown_display(days_remaining, event['priority'])
         
         # Main content container
         content_container = ctk.CTkFrame(self.countdown_frame, corner_radius=15)
@@ -636,11 +757,11 @@ class CountdownApp:
         name_frame.pack(fill="x", padx=15, pady=(15, 10))
         name_frame.pack_propagate(False)
         
-        name_label = ctk.CTkLabel(
+        name_label = self.themed_widgets.create(
+            ctk.CTkLabel, "text",
             name_frame,
             text=event['name'],
             font=("Segoe UI", 24, "bold"),
-            text_color=self.theme_manager.current_theme["text_color"],
             wraplength=400
         )
         name_label.pack(expand=True)
@@ -649,22 +770,6 @@ class CountdownApp:
         countdown_container = ctk.CTkFrame(content_container, corner_radius=15)
         countdown_container.pack(fill="x", padx=15, pady=10)
         
-        if days_remaining > 0:
-            countdown_text = f"{days_remaining}"
-            subtitle_text = "days remaining"
-            emoji = "⏰"
-            bg_gradient = priority_color
-        elif days_remaining == 0:
-            countdown_text = "TODAY"
-            subtitle_text = "is the day!"
-            emoji = "🎉"
-            bg_gradient = "#dc3545"
-        else:
-            countdown_text = f"{abs(days_remaining)}"
-            subtitle_text = "days ago"
-            emoji = "📅"
-            bg_gradient = "#6c757d"
-        
         # Big countdown display
         countdown_display_frame = ctk.CTkFrame(countdown_container, corner_radius=12, height=120)
         countdown_display_frame.pack(fill="x", padx=15, pady=15)
@@ -673,18 +778,18 @@ class CountdownApp:
         # Emoji and countdown number
         main_display = ctk.CTkLabel(
             countdown_display_frame,
-            text=f"{emoji} {countdown_text}",
+            text=countdown['text'],
             font=("Segoe UI", 48, "bold"),
-            text_color=bg_gradient
+            text_color=countdown['color']
         )
         main_display.pack(expand=True)
         
         # Subtitle
-        subtitle_label = ctk.CTkLabel(
+        subtitle_label = self.themed_widgets.create(
+            ctk.CTkLabel, "text",
             countdown_container,
-            text=subtitle_text,
-            font=("Segoe UI", 18),
-            text_color=self.theme_manager.current_theme["text_color"]
+            text=countdown['subtitle'],
+            font=("Segoe UI", 18)
         )
         subtitle_label.pack(pady=(0, 15))
         
@@ -696,18 +801,18 @@ class CountdownApp:
         date_info_frame = ctk.CTkFrame(details_frame, fg_color="transparent")
         date_info_frame.pack(fill="x", padx=15, pady=10)
         
-        ctk.CTkLabel(
+        self.themed_widgets.create(
+            ctk.CTkLabel, "text",
             date_info_frame,
             text="📅 Event Date:",
-            font=("Segoe UI", 12, "bold"),
-            text_color=self.theme_manager.current_theme["text_color"]
+            font=("Segoe UI", 12, "bold")
         ).pack(side="left")
         
-        ctk.CTkLabel(
+        self.themed_widgets.create(
+            ctk.CTkLabel, "accent_text",
             date_info_frame,
             text=event['event_date'],
-            font=("Segoe UI", 12),
-            text_color=self.theme_manager.current_theme["accent_color"]
+            font=("Segoe UI", 12)
         ).pack(side="right")
         
         # Priority info
@@ -715,37 +820,38 @@ class CountdownApp:
         priority_info_frame.pack(fill="x", padx=15, pady=(0, 10))
         
         priority_name = PriorityColorManager.get_priority_name(event['priority'])
-        ctk.CTkLabel(
+        self.themed_widgets.create(
+            ctk.CTkLabel, "text",
             priority_info_frame,
             text="⭐ Priority:",
-            font=("Segoe UI", 12, "bold"),
-            text_color=self.theme_manager.current_theme["text_color"]
+            font=("Segoe UI", 12, "bold")
         ).pack(side="left")
         
-        ctk.CTkLabel(
+        priority_label = ctk.CTkLabel(
             priority_info_frame,
             text=priority_name,
             font=("Segoe UI", 12, "bold"),
-            text_color=priority_color
-        ).pack(side="right")
+            text_color=countdown['priority_color']
+        )
+        priority_label.pack(side="right")
         
         # Description if available
         if event['description']:
             desc_frame = ctk.CTkFrame(details_frame, corner_radius=8)
             desc_frame.pack(fill="x", padx=15, pady=(0, 15))
             
-            ctk.CTkLabel(
+            self.themed_widgets.create(
+                ctk.CTkLabel, "text",
                 desc_frame,
                 text="📝 Description:",
-                font=("Segoe UI", 12, "bold"),
-                text_color=self.theme_manager.current_theme["text_color"]
+                font=("Segoe UI", 12, "bold")
             ).pack(anchor="w", padx=15, pady=(10, 5))
             
-            desc_label = ctk.CTkLabel(
+            desc_label = self.themed_widgets.create(
+                ctk.CTkLabel, "text",
                 desc_frame,
                 text=event['description'],
                 font=("Segoe UI", 11),
-                text_color=self.theme_manager.current_theme["text_color"],
                 wraplength=400,
                 justify="left"
             )
@@ -784,203 +890,109 @@ class CountdownApp:
         )
         delete_btn.pack(side="left", padx=8)
         
-        # Update system tray
+        # Labels the day tick updates in place
+        self.countdown_view = {
+            'event': event,
+            'countdown': countdown,
+            'main': main_display,
+            'subtitle': subtitle_label,
+            'priority': priority_label
+        }
+        
+        self._update_tray_countdown(event, days_remaining)
+    
+    def _update_tray_countdown(self, event, days_remaining):
+        """Update system tray"""
         self.tray_manager.update_icon_with_countdown(days_remaining)
         self.tray_notification_manager.update_tray_tooltip({
             'name': event['name'],
             'days': days_remaining
         })
     
+    def _on_day_changed(self, now):
+        """Day tick: recompute day counts and update only what they change"""
+        today = now.date().toordinal()
+        for event in self.current_events:
+            event['days_remaining'] = event.ordinal - today
+        
+        # Every count shifts by the same amount, so the order is unchanged;
+        # only the cards in view are re-bound
+        self.event_list.set_events(self.current_events)
+        
+        if self.selected_event_id is None:
+            # The next upcoming event may have changed
+            self.show_default_countdown()
+        elif self.countdown_view:
+            view = self.countdown_view
+            days_remaining = view['event'].ordinal - today
+            countdown = countdown_display(days_remaining, view['event']['priority'])
+            
+            if countdown['text'] != view['countdown']['text'] or countdown['color'] != view['countdown']['color']:
+                view['main'].configure(text=countdown['text'], text_color=countdown['color'])
+            if countdown['subtitle'] != view['countdown']['subtitle']:
+                view['subtitle'].configure(text=countdown['subtitle'])
+            if countdown['priority_color'] != view['countdown']['priority_color']:
+                view['priority'].configure(text_color=countdown['priority_color'])
+            view['countdown'] = countdown
+            
+            self._update_tray_countdown(view['event'], days_remaining)
+    
     def refresh_events(self):
         """Refresh the event list"""
-        # Clear current event list
-        for widget in self.events_scrollable.winfo_children():
-            widget.destroy()
-        
         # Load events from database
         self.current_events = self.db_manager.get_all_events()
         
-        if not self.current_events:
-            no_events_label = ctk.CTkLabel(
-                self.events_scrollable,
-                text="No events yet.\nClick 'Add Event' to get started!",
-                font=("Arial", 12),
-                text_color=self.theme_manager.current_theme["text_color"]
-            )
-            no_events_label.pack(pady=20)
-        else:
-            # Sort events by date
-            today = datetime.now().date()
-            for event in self.current_events:
-                event_date = datetime.strptime(event['event_date'], "%Y-%m-%d").date()
-                event['days_remaining'] = (event_date - today).days
-            
-            # Sort by days remaining (upcoming first), then by priority
-            self.current_events.sort(key=lambda x: (x['days_remaining'], -x['priority']))
-            
-            # Create event cards
-            for event in self.current_events:
-                self.create_event_card(event)
+        today = today_ordinal()
+        for event in self.current_events:
+            event['days_remaining'] = event.ordinal - today
+        
+        # Sort by days remaining (upcoming first), then by priority
+        self.current_events.sort(key=event_sort_key)
+        
+        # Only the cards in view are (re)bound; the rest are never built
+        self.event_list.set_events(self.current_events)
         
         # Update default countdown display
         self.show_default_countdown()
     
-    def create_event_card(self, event):
-        """Create a professional card widget for an event"""
-        # Enhanced event card with modern styling
-        card = ctk.CTkFrame(
-            self.events_scrollable, 
-            corner_radius=15, 
-            height=110,
-            fg_color=COLORS["card"],
-            border_width=1,
-            border_color=COLORS["border"]
-        )
-        card.pack(fill="x", padx=10, pady=8)
-        card.pack_propagate(False)
-        
-        # Hover effects with modern colors
-        def on_enter(e):
-            card.configure(
-                fg_color=COLORS["hover"],
-                border_color=COLORS["accent"]
-            )
-        
-        def on_leave(e):
-            card.configure(
-                fg_color=COLORS["card"],
-                border_color=COLORS["border"]
-            )
-        
-        def on_click(e):
-            self.select_event(event)
-            
-        card.bind("<Button-1>", on_click)
-        card.bind("<Enter>", on_enter)
-        card.bind("<Leave>", on_leave)
-        
-        # Calculate time remaining
-        days_remaining = event.get('days_remaining', 0)
-        priority_color = PriorityColorManager.get_days_remaining_color(
-            days_remaining, event['priority']
-        )
-        
-        # Priority indicator with modern design
-        priority_indicator = ctk.CTkFrame(
-            card, 
-            width=6, 
-            corner_radius=3,
-            fg_color=priority_color
-        )
-        priority_indicator.pack(side="left", fill="y", padx=(15, 0), pady=15)
-        
-        # Main content container
-        content_container = ctk.CTkFrame(card, fg_color="transparent")
-        content_container.pack(side="left", fill="both", expand=True, padx=20, pady=15)
-        
-        # Header section with event name and status
-        header_frame = ctk.CTkFrame(content_container, fg_color="transparent")
-        header_frame.pack(fill="x")
+    def _on_events_changed(self, action, event_id):
+        """Database change listener; patches the UI on the Tk thread"""
+        if not self.root:
+            return
         
-        # Event name with professional typography
-        event_name = event['name']
-        if len(event_name) > 30:
-            event_name = event_name[:27] + "..."
-            
-        name_label = ctk.CTkLabel(
-            header_frame,
-            text=event_name,
-            font=("SF Pro Display", 16, "bold"),
-            text_color=COLORS["text_primary"],
-            anchor="w"
-        )
-        name_label.pack(side="left", fill="x", expand=True)
-        
-        # Status badge with modern styling
-        if days_remaining > 0:
-            status_text = f"{days_remaining}d"
-            badge_color = COLORS["accent"]
-        elif days_remaining == 0:
-            status_text = "TODAY"
-            badge_color = COLORS["warning"]
+        if threading.current_thread() is threading.main_thread():
+            self._apply_event_change(action, event_id)
         else:
-            status_text = f"{abs(days_remaining)}d overdue"
-            badge_color = COLORS["error"]
-        
-        status_badge = ctk.CTkLabel(
-            header_frame,
-            text=status_text,
-            font=("SF Pro Display", 11, "bold"),
-            text_color="white",
-            fg_color=badge_color,
-            corner_radius=15,
-            width=80,
-            height=28
-        )
-        status_badge.pack(side="right")
-        
-        # Details section
-        details_frame = ctk.CTkFrame(content_container, fg_color="transparent")
-        details_frame.pack(fill="x", pady=(8, 0))
-        
-        # Event date with icon
-        event_date = event.get('event_date') or event.get('target_date')
-        if isinstance(event_date, str):
-            # Parse date string if needed
-            from datetime import datetime
-            event_date = datetime.fromisoformat(event_date.replace('Z', '+00:00'))
-        
-        date_str = event_date.strftime("%B %d, %Y")
-        date_label = ctk.CTkLabel(
-            details_frame,
-            text=f"📅 {date_str}",
-            font=("SF Pro Display", 12),
-            text_color=COLORS["text_secondary"],
-            anchor="w"
-        )
-        date_label.pack(side="left")
-        
-        # Priority level with modern indicator
-        priority_value = event.get('priority', 'medium')
-        
-        # Handle both numeric and text priority values
-        if isinstance(priority_value, int):
-            priority_num_map = {1: "low", 2: "medium", 3: "high", 4: "high", 5: "high"}
-            priority_value = priority_num_map.get(priority_value, "medium")
-        
-        priority_map = {"high": "🔴 High", "medium": "🟡 Medium", "low": "🟢 Low"}
-        priority_text = priority_map.get(priority_value, str(priority_value))
-        
-        priority_label = ctk.CTkLabel(
-            details_frame,
-            text=priority_text,
-            font=("SF Pro Display", 11),
-            text_color=COLORS["text_secondary"]
-        )
-        priority_label.pack(side="right")
-        
-        return card
+            # Import workers and the IPC listener must not touch Tk themselves
+            self.call_on_tk_thread(self._apply_event_change, action, event_id)
+    
+    def _apply_event_change(self, action, event_id):
+        """Apply one row-level change to the event list and detail panel"""
+        if action == "reload":
+            self.refresh_events()
+            return
         
-        # Event date
-        date_label = ctk.CTkLabel(
-            bottom_frame,
-            text=f"📅 {event['event_date']}",
-            font=("Segoe UI", 11),
-            text_color=self.theme_manager.current_theme["text_color"],
-            anchor="w"
-        )
-        date_label.pack(side="left")
+        event = None
+        if action != "delete":
+            event = self.db_manager.get_event_by_id(event_id)
+            if event is not None and not event['is_active']:
+                event = None
         
-        # Priority label
-        priority_name = PriorityColorManager.get_priority_name(event['priority'])
-        priority_label = ctk.CTkLabel(
-            bottom_frame,
-            text=f"⭐ {priority_name}",
-            font=("Segoe UI", 10),
-            text_color=priority_color,
-            anchor="e"
-        )
-        priority_label.pack(side="right")
+        if event is None:
+            self.event_list.remove_event(event_id)
+        else:
+            event['days_remaining'] = event.ordinal - today_ordinal()
+            self.event_list.upsert_event(event)
+        
+        # The detail panel only changes if it shows this event or the next-upcoming view
+        if self.selected_event_id == event_id:
+            if event is None:
+                self.selected_event_id = None
+                self.show_default_countdown()
+            else:
+                self.show_event_countdown(event)
+        elif self.selected_event_id is None:
+            self.show_default_countdown()
     
     def select_event(self, event):
         """Select an event to show in detail view"""
@@ -993,7 +1005,8 @@ class CountdownApp:
         dialog.title("Add New Event")
         center_window(dialog, 500, 700)
         dialog.resizable(False, False)
-        dialog.configure(fg_color=self.theme_manager.current_theme["window_bg"])
+        dialog.configure(**self.theme_manager.styles["window"])
+        self.themed_widgets.add(dialog, "window")
         
         # Center dialog and make it modal
         if self.root:
@@ -1005,11 +1018,11 @@ class CountdownApp:
         main_container.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Title
-        title_label = ctk.CTkLabel(
+        title_label = self.themed_widgets.create(
+            ctk.CTkLabel, "accent_text",
             main_container, 
             text="🎯 Create New Event", 
-            font=("Segoe UI", 20, "bold"),
-            text_color=self.theme_manager.current_theme["accent_color"]
+            font=("Segoe UI", 20, "bold")
         )
         title_label.pack(pady=(20, 15))
         
@@ -1151,7 +1164,6 @@ class CountdownApp:
             )
             
             dialog.destroy()
-            self.refresh_events()
             messagebox.showinfo("Success", f"Event '{name}' added successfully!")
         
         # Buttons with enhanced styling - now properly visible
@@ -1199,7 +1211,6 @@ class CountdownApp:
         """Delete an event with confirmation"""
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this event?"):
             self.db_manager.delete_event(event_id)
-            self.refresh_events()
             messagebox.showinfo("Success", "Event deleted successfully!")
     
     def show_theme_selector(self):
@@ -1208,7 +1219,8 @@ class CountdownApp:
         dialog.title("Choose Theme")
         center_window(dialog, 500, 400)
         dialog.resizable(False, False)
-        dialog.configure(fg_color=self.theme_manager.current_theme["window_bg"])
+        dialog.configure(**self.theme_manager.styles["window"])
+        self.themed_widgets.add(dialog, "window")
         
         if self.root:
             dialog.transient(self.root)
@@ -1219,11 +1231,11 @@ class CountdownApp:
         main_container.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Title
-        title_label = ctk.CTkLabel(
+        title_label = self.themed_widgets.create(
+            ctk.CTkLabel, "accent_text",
             main_container,
             text="🎨 Choose Your Theme",
-            font=("Segoe UI", 20, "bold"),
-            text_color=self.theme_manager.current_theme["accent_color"]
+            font=("Segoe UI", 20, "bold")
         )
         title_label.pack(pady=(20, 25))
         
@@ -1237,7 +1249,6 @@ class CountdownApp:
         def apply_theme(theme_id):
             self.theme_manager.set_current_theme(theme_id)
             self.apply_theme()
-            self.refresh_events()
             dialog.destroy()
             messagebox.showinfo("Theme Applied", f"Theme '{theme_id}' has been applied successfully!")
         
@@ -1263,11 +1274,11 @@ class CountdownApp:
             info_frame.pack(fill="x", padx=15, pady=(0, 10))
             
             # Theme name
-            name_label = ctk.CTkLabel(
+            name_label = self.themed_widgets.create(
+                ctk.CTkLabel, "text",
                 info_frame,
                 text=theme['name'],
-                font=("Segoe UI", 14, "bold"),
-                text_color=self.theme_manager.current_theme["text_color"]
+                font=("Segoe UI", 14, "bold")
             )
             name_label.pack(side="left")
             
@@ -1313,7 +1324,8 @@ class CountdownApp:
         dialog.title("Settings")
         center_window(dialog, 400, 300)
         dialog.resizable(False, False)
-        dialog.configure(fg_color=self.theme_manager.current_theme["window_bg"])
+        dialog.configure(**self.theme_manager.styles["window"])
+        self.themed_widgets.add(dialog, "window")
         
         if self.root:
             dialog.transient(self.root)
@@ -1324,11 +1336,11 @@ class CountdownApp:
         main_container.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Title
-        title_label = ctk.CTkLabel(
+        title_label = self.themed_widgets.create(
+            ctk.CTkLabel, "accent_text",
             main_container,
             text="⚙️ Settings",
-            font=("Segoe UI", 20, "bold"),
-            text_color=self.theme_manager.current_theme["accent_color"]
+            font=("Segoe UI", 20, "bold")
         )
         title_label.pack(pady=(20, 25))
         
@@ -1349,11 +1361,11 @@ class CountdownApp:
         test_notif_btn.pack(pady=20)
         
         # About section
-        about_label = ctk.CTkLabel(
+        about_label = self.themed_widgets.create(
+            ctk.CTkLabel, "text",
             settings_frame,
             text="Enhanced Countdown Widget v2.0\nBuilt with CustomTkinter",
             font=("Segoe UI", 11),
-            text_color=self.theme_manager.current_theme["text_color"],
             justify="center"
         )
         about_label.pack(pady=10)
@@ -1377,8 +1389,10 @@ class CountdownApp:
         if not self.root:
             return
         
-        theme = self.theme_manager.current_theme
-        self.root.configure(fg_color=theme["window_bg"])
+        styles = self.theme_manager.styles
+        self.root.configure(**styles["window"])
+        # Re-style themed widgets in place instead of rebuilding the UI
+        self.themed_widgets.apply(styles)
     
     def minimize_to_tray(self):
         """Minimize application to system tray"""
@@ -1389,89 +1403,158 @@ class CountdownApp:
         """Quit the application completely"""
         self.notification_manager.stop_monitoring()
         self.tray_manager.stop()
+        if self.day_ticker:
+            self.day_ticker.stop()
+        self.db_manager.close()
+        if self.instance:
+            self.instance.release()
         
         if self.root:
             self.root.quit()
         
         sys.exit()
     
+    def run_background_task(self, title: str, job, on_done, on_cancelled):
+        """Run job(task) on a worker thread behind a progress dialog with a Cancel button.
+        
+        on_done(result) runs if the job finished, on_cancelled() if Cancel stopped it.
+        """
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title(title)
+        center_window(dialog, 360, 160)
+        dialog.resizable(False, False)
+        dialog.configure(**self.theme_manager.styles["window"])
+        self.themed_widgets.add(dialog, "window")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        status_label = self.themed_widgets.create(
+            ctk.CTkLabel, "text",
+            dialog,
+            text=f"{title}...",
+            font=("Segoe UI", 12)
+        )
+        status_label.pack(pady=(20, 10))
+        
+        progress_bar = ctk.CTkProgressBar(dialog, width=300)
+        progress_bar.pack(pady=5)
+        progress_bar.set(0)
+        
+        def on_progress(done, total):
+            if total:
+                progress_bar.set(done / total)
+                status_label.configure(text=f"{title}: {done:,} of {total:,}")
+            else:
+                status_label.configure(text=f"{title}: {done:,}")
+        
+        def finish(callback, value):
+            dialog.grab_release()
+            dialog.destroy()
+            callback(value)
+        
+        def on_error(error):
+            finish(lambda e: messagebox.showerror(f"{title} Error", f"{title} failed: {e}"), error)
+        
+        task = BackgroundTask(
+            self.root, job,
+            on_progress=on_progress,
+            on_done=lambda result: finish(on_done, result),
+            on_error=on_error,
+            on_cancelled=lambda: finish(lambda _: on_cancelled(), None),
+            on_exit=self.db_manager.release_connection
+        )
+        
+        def cancel():
+            task.cancel()
+            cancel_btn.configure(state="disabled", text="Cancelling...")
+        
+        cancel_btn = ctk.CTkButton(
+            dialog,
+            text="Cancel",
+            command=cancel,
+            width=100,
+            height=30,
+            fg_color="#6c757d",
+            hover_color="#5a6268",
+            corner_radius=8
+        )
+        cancel_btn.pack(pady=(15, 10))
+        dialog.protocol("WM_DELETE_WINDOW", cancel)
+        
+        task.start()
+        return task
+    
     def export_events(self):
-        """Export events to JSON file"""
+        """Export events to a JSON, NDJSON or CSV file"""
         try:
             from tkinter import filedialog
-            import json
             
-            events = self.db_manager.get_all_events()
-            if not events:
+            if not self.db_manager.get_events_page(limit=1):
                 messagebox.showinfo("Export", "No events to export.")
                 return
             
             filename = filedialog.asksaveasfilename(
                 defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+                filetypes=FILE_TYPES
             )
             
             if filename:
-                # Convert datetime objects to strings for JSON serialization
-                export_data = []
-                for event in events:
-                    event_data = event.copy()
-                    if 'target_date' in event_data:
-                        event_data['target_date'] = event_data['target_date'].isoformat()
-                    export_data.append(event_data)
-                
-                with open(filename, 'w') as f:
-                    json.dump(export_data, f, indent=2)
-                
-                messagebox.showinfo("Export Complete", f"Events exported to {filename}")
+                self.run_background_task(
+                    "Exporting events",
+                    lambda task: export_events_file(self.db_manager, filename, task.report),
+                    lambda count: messagebox.showinfo(
+                        "Export Complete", f"{count} events exported to {filename}"),
+                    lambda: messagebox.showinfo("Export Cancelled", "No file was written.")
+                )
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export events: {str(e)}")
     
     def import_events(self):
-        """Import events from JSON file"""
+        """Import events from a JSON, NDJSON or CSV file"""
         try:
             from tkinter import filedialog
-            import json
-            from datetime import datetime
             
-            filename = filedialog.askopenfilename(
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-            )
+            filename = filedialog.askopenfilename(filetypes=FILE_TYPES)
             
             if filename:
-                with open(filename, 'r') as f:
-                    import_data = json.load(f)
+                def done(result):
+                    imported_count, errors = result
+                    message = f"Successfully imported {imported_count} events."
+                    if errors:
+                        for index, error in errors:
+                            print(f"Failed to import event {index + 1}: {error}")
+                        shown = "\n".join(f"• #{index + 1}: {error}" for index, error in errors[:5])
+                        more = f"\n… and {len(errors) - 5} more" if len(errors) > 5 else ""
+                        message += f"\n\nSkipped {len(errors)} invalid events:\n{shown}{more}"
+                    messagebox.showinfo("Import Complete", message)
                 
-                imported_count = 0
-                for event_data in import_data:
-                    try:
-                        # Convert date string back to datetime
-                        if 'target_date' in event_data:
-                            event_data['target_date'] = datetime.fromisoformat(event_data['target_date'])
-                        
-                        # Remove ID to create new events
-                        if 'id' in event_data:
-                            del event_data['id']
-                        
-                        self.db_manager.add_event(
-                            event_data['name'],
-                            event_data['target_date'],
-                            event_data.get('priority', 'medium'),
-                            event_data.get('description', '')
-                        )
-                        imported_count += 1
-                    except Exception as e:
-                        print(f"Failed to import event: {e}")
-                        continue
-                
-                self.refresh_events()
-                messagebox.showinfo("Import Complete", f"Successfully imported {imported_count} events.")
+                # The event list reloads once, from the "reload" change the import emits
+                self.run_background_task(
+                    "Importing events",
+                    lambda task: import_events_file(self.db_manager, filename, task.report),
+                    done,
+                    lambda: messagebox.showinfo(
+                        "Import Cancelled",
+                        "Import cancelled; events imported before cancelling were kept.")
+                )
         except Exception as e:
             messagebox.showerror("Import Error", f"Failed to import events: {str(e)}")
 
 def main():
     """Main application entry point"""
-    app = CountdownApp()
+    if PROFILE_FLAG in sys.argv[1:] and "importtime" not in sys._xoptions:
+        # Re-run under -X importtime so the report includes module import costs
+        sys.exit(run_profiled(os.path.abspath(__file__), sys.argv[1:]))
+    
+    instance = SingleInstance()
+    if not instance.acquire():
+        # Lost a race with another launch that is still starting up
+        if not forward_launch(sys.argv[1:], timeout=CONNECT_TIMEOUT):
+            print("Countdown Pro is already running", file=sys.stderr)
+        sys.exit(0)
+    
+    app = CountdownApp(profiler=StartupProfiler(enabled=PROFILE_FLAG in sys.argv[1:]),
+                       instance=instance, launch=launch_command(sys.argv[1:]))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,337 @@
+"""Streaming event import/export in JSON, NDJSON, CSV and iCalendar (.ics).
+
+Every reader and writer handles one record at a time, so memory stays
+bounded no matter how large the file or the events table is.
+"""
+import csv
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, TextIO
+
+from database import DatabaseManager, Event
+
+# File extension -> format
+FORMATS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".ics": "ics",
+}
+
+# For file dialogs
+FILE_TYPES = [
+    ("JSON files", "*.json"),
+    ("NDJSON files", "*.ndjson *.jsonl"),
+    ("CSV files", "*.csv"),
+    ("iCalendar files", "*.ics"),
+    ("All files", "*.*"),
+]
+
+# Events written or read between progress callbacks
+PROGRESS_EVERY = 1000
+
+# Bytes read at a time by the incremental JSON parser
+READ_SIZE = 64 * 1024
+
+# A decode error within this many characters of the end of the buffer may
+# just be a record cut off by the last read (a literal such as "fals", or
+# a \uXXXX escape); errors further back are real syntax errors
+JSON_INCOMPLETE_TAIL = 8
+
+# Longest single record read_json will buffer while waiting for its end
+MAX_JSON_RECORD_CHARS = 16 * 1024 * 1024
+
+# Files saved by Excel and Notepad start with a byte order mark, which
+# "utf-8-sig" skips (otherwise the first CSV header reads "\ufeffname")
+INPUT_ENCODING = "utf-8-sig"
+
+# CSV cells are strings; these columns are converted back to integers
+CSV_INTEGER_FIELDS = ('id', 'is_active', 'notification_enabled',
+                      'notification_days_before', 'priority')
+
+# iCalendar PRIORITY runs 1 (highest) to 9 (lowest), 0 meaning undefined;
+# the app's runs 1 (low) to 5 (urgent)
+ICS_PRIORITY_TO_EVENT = {1: 5, 2: 4, 3: 3, 4: 3, 5: 2, 6: 1, 7: 1, 8: 1, 9: 1}
+EVENT_PRIORITY_TO_ICS = {5: 1, 4: 2, 3: 3, 2: 5, 1: 9}
+
+# A backslash and the character it escapes in a TEXT value
+ICS_ESCAPE = re.compile(r"\\(.?)", re.DOTALL)
+
+# Content lines are folded at 75 octets (RFC 5545 3.1)
+ICS_LINE_OCTETS = 75
+
+def format_for(filename: str) -> str:
+    """Pick the file format from the extension (JSON for anything unknown)"""
+    return FORMATS.get(os.path.splitext(filename)[1].lower(), "json")
+
+def write_json(events: Iterable[Event], f: TextIO) -> Iterator[int]:
+    """Write a JSON array laid out like json.dump(events, f, indent=2)"""
+    count = 0
+    f.write("[")
+    for event in events:
+        item = json.dumps(event.copy(), indent=2).replace("\n", "\n  ")
+        f.write(("\n  " if count == 0 else ",\n  ") + item)
+        count += 1
+        yield count
+    f.write("\n]" if count else "]")
+
+def write_ndjson(events: Iterable[Event], f: TextIO) -> Iterator[int]:
+    """Write one compact JSON object per line"""
+    count = 0
+    for event in events:
+        f.write(json.dumps(event.copy()))
+        f.write("\n")
+        count += 1
+        yield count
+
+def write_csv(events: Iterable[Event], f: TextIO) -> Iterator[int]:
+    """Write a header row of Event.FIELDS and one row per event"""
+    writer = csv.writer(f)
+    writer.writerow(Event.FIELDS)
+    count = 0
+    for event in events:
+        writer.writerow([event[field] for field in Event.FIELDS])
+        count += 1
+        yield count
+
+def read_json(f: TextIO) -> Iterator[Dict]:
+    """Yield the objects of a JSON array (or a single JSON object) incrementally"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    
+    while True:
+        # Skip whitespace and the array punctuation between objects
+        while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+            position += 1
+        
+        if position < len(buffer):
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                # Only read more when the record may simply be incomplete, so
+                # a syntax error early in a large file is raised straight away
+                incomplete = (e.pos >= len(buffer) - JSON_INCOMPLETE_TAIL
+                              or e.msg.startswith("Unterminated string"))
+                if eof or not incomplete or len(buffer) - position > MAX_JSON_RECORD_CHARS:
+                    raise
+                record = None
+            if record is not None:
+                yield record
+                position = end
+                continue
+        elif eof:
+            return
+        
+        # Need more input: drop what has been consumed and read the next block
+        chunk = f.read(READ_SIZE)
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+
+def read_ndjson(f: TextIO) -> Iterator[Dict]:
+    """Yield one object per non-blank line"""
+    for line_number, line in enumerate(f, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {line_number}: {e}") from None
+
+def read_csv(f: TextIO) -> Iterator[Dict]:
+    """Yield one record per row, keyed by the header row"""
+    for row in csv.DictReader(f):
+        record = {}
+        for key, value in row.items():
+            if key is None or value in (None, ""):
+                continue  # Extra cells or empty values fall back to defaults
+            if key in CSV_INTEGER_FIELDS:
+                try:
+                    value = int(value)
+                except ValueError:
+                    # Names such as "high" or "false" are parsed, and anything
+                    # else reported, by event_values_from_record
+                    pass
+            record[key] = value
+        yield record
+
+def ics_escape(text: str) -> str:
+    """Escape a TEXT property value"""
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def ics_unescape(value: str) -> str:
+    """Undo TEXT escaping (\\n, \\N, \\, \\; and \\\\)"""
+    if "\\" not in value:
+        return value
+    return ICS_ESCAPE.sub(lambda m: "\n" if m.group(1) in ("n", "N") else m.group(1), value)
+
+def ics_fold(line: str) -> str:
+    """Fold a content line into CRLF-terminated chunks of at most 75 octets"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    
+    parts = []
+    start = 0
+    limit = ICS_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split a multi-byte UTF-8 character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = ICS_LINE_OCTETS - 1  # Continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+def write_ics(events: Iterable[Event], f: TextIO) -> Iterator[int]:
+    """Write a VCALENDAR with one all-day VEVENT per event"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Countdown Widget//EN\r\n")
+    count = 0
+    for event in events:
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:event-{event['id']}@countdown-widget",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{event['event_date'].replace('-', '')}",
+            f"SUMMARY:{ics_escape(event['name'])}",
+        ]
+        if event['description']:
+            lines.append(f"DESCRIPTION:{ics_escape(event['description'])}")
+        lines.append(f"PRIORITY:{EVENT_PRIORITY_TO_ICS.get(event['priority'], 0)}")
+        lines.append("END:VEVENT")
+        f.write("".join(ics_fold(line) for line in lines))
+        count += 1
+        yield count
+    f.write("END:VCALENDAR\r\n")
+
+def ics_content_lines(f: TextIO) -> Iterator[str]:
+    """Yield unfolded content lines, reading the file line by line"""
+    pending = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+def ics_split_property(line: str):
+    """Split 'NAME;PARAM=x:value' into (NAME, params string, value)"""
+    # The value starts at the first colon outside a quoted parameter value
+    colon = line.find(":")
+    if colon < 0:
+        return None, "", ""
+    if '"' in line[:colon]:
+        quoted = False
+        for index, char in enumerate(line):
+            if char == '"':
+                quoted = not quoted
+            elif char == ":" and not quoted:
+                colon = index
+                break
+        else:
+            return None, "", ""
+    head, value = line[:colon], line[colon + 1:]
+    name, _, params = head.partition(";")
+    return name.upper(), params, value
+
+def read_ics(f: TextIO) -> Iterator[Dict]:
+    """Yield one event record per VEVENT.
+    
+    SUMMARY becomes the name, DESCRIPTION the description, the date part of
+    DTSTART the event date and PRIORITY is mapped onto the app's 1-5 scale.
+    Properties of nested components (VALARM) are ignored.
+    """
+    record = None
+    nested = 0
+    
+    for line in ics_content_lines(f):
+        name, params, value = ics_split_property(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT":
+                record = {}
+                nested = 0
+            elif record is not None:
+                nested += 1
+        elif name == "END":
+            if value.upper() == "VEVENT" and record is not None:
+                yield record
+                record = None
+            elif record is not None and nested:
+                nested -= 1
+        elif record is None or nested:
+            continue
+        elif name == "SUMMARY":
+            record['name'] = ics_unescape(value)
+        elif name == "DESCRIPTION":
+            record['description'] = ics_unescape(value)
+        elif name == "DTSTART":
+            # DATE (20250712) or DATE-TIME (20250712T100000[Z]); the date is kept as written
+            digits = value.strip()[:8]
+            record['event_date'] = f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}" if digits.isdigit() else value
+        elif name == "PRIORITY":
+            try:
+                level = int(value)
+            except ValueError:
+                continue
+            if level in ICS_PRIORITY_TO_EVENT:
+                record['priority'] = ICS_PRIORITY_TO_EVENT[level]
+
+WRITERS = {"json": write_json, "ndjson": write_ndjson, "csv": write_csv, "ics": write_ics}
+READERS = {"json": read_json, "ndjson": read_ndjson, "csv": read_csv, "ics": read_ics}
+
+# Formats whose line endings the reader/writer handle themselves
+RAW_NEWLINE_FORMATS = ("csv", "ics")
+
+def export_events_file(db_manager: DatabaseManager, filename: str,
+                       progress: Callable[[int, int], None] = None, fmt: str = None) -> int:
+    """Stream all active events to a file; returns the number written.
+    
+    The file is written under a temporary name and renamed when complete,
+    so a failed or cancelled export leaves no partial file.
+    """
+    fmt = fmt or format_for(filename)
+    total = db_manager.count_events()
+    temp_name = f"{filename}.part"
+    count = 0
+    
+    try:
+        with open(temp_name, 'w', newline="" if fmt in RAW_NEWLINE_FORMATS else None,
+                  encoding="utf-8") as f:
+            for count in WRITERS[fmt](db_manager.iter_events(), f):
+                if progress and count % PROGRESS_EVERY == 0:
+                    progress(count, total)
+        os.replace(temp_name, filename)
+    finally:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+    
+    if progress:
+        progress(count, count)
+    return count
+
+def import_events_file(db_manager: DatabaseManager, filename: str,
+                       progress: Callable[[int, int], None] = None, fmt: str = None):
+    """Stream records from a file into DatabaseManager.bulk_add_events.
+    
+    Returns bulk_add_events' (imported count, errors). Progress totals are
+    unknown while streaming, so progress is called as progress(records, None).
+    """
+    fmt = fmt or format_for(filename)
+    with open(filename, 'r', newline="" if fmt in RAW_NEWLINE_FORMATS else None,
+              encoding=INPUT_ENCODING) as f:
+        return db_manager.bulk_add_events(
+            READERS[fmt](f),
+            progress=(lambda done: progress(done, None)) if progress else None
+        )
@@ -0,0 +1,304 @@
+import customtkinter as ctk
+from bisect import bisect_left
+from typing import Callable, Dict, List
+
+from date_utils import format_long_date
+from theme_manager import PriorityColorManager
+
+def event_sort_key(event):
+    """List order: soonest first, then highest priority; id keeps keys unique"""
+    return (event['days_remaining'], -event['priority'], event['id'])
+
+def event_card_content(event, colors: Dict) -> Dict:
+    """Compute everything an event card displays, without touching any widget"""
+    days_remaining = event.get('days_remaining', 0)
+    priority_color = PriorityColorManager.get_days_remaining_color(
+        days_remaining, event['priority']
+    )
+    
+    # Event name, truncated to fit the card
+    event_name = event['name']
+    if len(event_name) > 30:
+        event_name = event_name[:27] + "..."
+    
+    # Status badge
+    if days_remaining > 0:
+        status_text = f"{days_remaining}d"
+        badge_color = colors["accent"]
+    elif days_remaining == 0:
+        status_text = "TODAY"
+        badge_color = colors["warning"]
+    else:
+        status_text = f"{abs(days_remaining)}d overdue"
+        badge_color = colors["danger"]
+    
+    date_str = format_long_date(event['event_date'])
+    
+    # Handle both numeric and text priority values
+    priority_value = event.get('priority', 'medium')
+    if isinstance(priority_value, int):
+        priority_num_map = {1: "low", 2: "medium", 3: "high", 4: "high", 5: "high"}
+        priority_value = priority_num_map.get(priority_value, "medium")
+    
+    priority_map = {"high": "🔴 High", "medium": "🟡 Medium", "low": "🟢 Low"}
+    
+    return {
+        'name': event_name,
+        'status': status_text,
+        'badge_color': badge_color,
+        'priority_color': priority_color,
+        'date': f"📅 {date_str}",
+        'priority': priority_map.get(priority_value, str(priority_value))
+    }
+
+class EventCard:
+    """A reusable event card; widgets are built once and updated in place"""
+    
+    def __init__(self, parent, colors: Dict, height: int, on_select: Callable):
+        self.colors = colors
+        self.on_select = on_select
+        self.event = None
+        self._shown = {}
+        
+        # Enhanced event card with modern styling
+        self.frame = ctk.CTkFrame(
+            parent,
+            corner_radius=15,
+            height=height,
+            fg_color=colors["card"],
+            border_width=1,
+            border_color=colors["border"]
+        )
+        self.frame.pack_propagate(False)
+        
+        self.frame.bind("<Button-1>", self._on_click)
+        self.frame.bind("<Enter>", self._on_enter)
+        self.frame.bind("<Leave>", self._on_leave)
+        
+        # Priority indicator with modern design
+        self.priority_indicator = ctk.CTkFrame(self.frame, width=6, corner_radius=3)
+        self.priority_indicator.pack(side="left", fill="y", padx=(15, 0), pady=15)
+        
+        # Main content container
+        content_container = ctk.CTkFrame(self.frame, fg_color="transparent")
+        content_container.pack(side="left", fill="both", expand=True, padx=20, pady=15)
+        
+        # Header section with event name and status
+        header_frame = ctk.CTkFrame(content_container, fg_color="transparent")
+        header_frame.pack(fill="x")
+        
+        self.name_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=("SF Pro Display", 16, "bold"),
+            text_color=colors["text_primary"],
+            anchor="w"
+        )
+        self.name_label.pack(side="left", fill="x", expand=True)
+        
+        self.status_badge = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=("SF Pro Display", 11, "bold"),
+            text_color="white",
+            corner_radius=15,
+            width=80,
+            height=28
+        )
+        self.status_badge.pack(side="right")
+        
+        # Details section
+        details_frame = ctk.CTkFrame(content_container, fg_color="transparent")
+        details_frame.pack(fill="x", pady=(8, 0))
+        
+        self.date_label = ctk.CTkLabel(
+            details_frame,
+            text="",
+            font=("SF Pro Display", 12),
+            text_color=colors["text_secondary"],
+            anchor="w"
+        )
+        self.date_label.pack(side="left")
+        
+        self.priority_label = ctk.CTkLabel(
+            details_frame,
+            text="",
+            font=("SF Pro Display", 11),
+            text_color=colors["text_secondary"]
+        )
+        self.priority_label.pack(side="right")
+    
+    def show_event(self, event):
+        """Point this card at an event, reconfiguring only the values that changed"""
+        self.event = event
+        content = event_card_content(event, self.colors)
+        shown = self._shown
+        
+        if shown.get('name') != content['name']:
+            self.name_label.configure(text=content['name'])
+        if shown.get('status') != content['status']:
+            self.status_badge.configure(text=content['status'])
+        if shown.get('badge_color') != content['badge_color']:
+            self.status_badge.configure(fg_color=content['badge_color'])
+        if shown.get('priority_color') != content['priority_color']:
+            self.priority_indicator.configure(fg_color=content['priority_color'])
+        if shown.get('date') != content['date']:
+            self.date_label.configure(text=content['date'])
+        if shown.get('priority') != content['priority']:
+            self.priority_label.configure(text=content['priority'])
+        
+        self._shown = content
+    
+    def _on_click(self, e):
+        if self.event is not None:
+            self.on_select(self.event)
+    
+    # Hover effects with modern colors
+    def _on_enter(self, e):
+        self.frame.configure(fg_color=self.colors["hover"], border_color=self.colors["accent"])
+    
+    def _on_leave(self, e):
+        self.frame.configure(fg_color=self.colors["card"], border_color=self.colors["border"])
+
+class VirtualEventList:
+    """Scrollable event list that only creates cards for the visible rows.
+    
+    Cards are positioned with place() inside a fixed viewport and recycled as
+    the list scrolls, so refreshing or scrolling costs the same for 10 or
+    10,000 events.
+    """
+    
+    CARD_HEIGHT = 110
+    CARD_SPACING = 16
+    WHEEL_STEP = 40
+    
+    def __init__(self, parent, colors: Dict, on_select: Callable,
+                 empty_text: str = "No events yet.\nClick 'Add Event' to get started!",
+                 empty_text_color: str = None):
+        self.colors = colors
+        self.on_select = on_select
+        self.events = []
+        # Sorted keys parallel to self.events, for O(log n) position lookups
+        self._keys = []
+        self._key_by_id = {}
+        self.cards = []
+        self.scroll_top = 0
+        self.row_height = self.CARD_HEIGHT + self.CARD_SPACING
+        
+        self.container = ctk.CTkFrame(parent, corner_radius=12, fg_color="transparent")
+        
+        self.scrollbar = ctk.CTkScrollbar(
+            self.container,
+            command=self._on_scrollbar,
+            fg_color=colors["secondary"],
+            button_color=colors["accent"],
+            button_hover_color=colors["accent_hover"]
+        )
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.viewport = ctk.CTkFrame(self.container, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", lambda e: self.render())
+        
+        self.empty_label = ctk.CTkLabel(
+            self.viewport,
+            text=empty_text,
+            font=("Arial", 12),
+            text_color=empty_text_color
+        )
+        
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.viewport.bind_all(sequence, self._on_mouse_wheel, add="+")
+    
+    def pack(self, **kwargs):
+        self.container.pack(**kwargs)
+    
+    def set_events(self, events: List):
+        """Replace the list contents (already sorted by event_sort_key) and redraw"""
+        self.events = events
+        self._keys = [event_sort_key(event) for event in events]
+        self._key_by_id = {event['id']: key for event, key in zip(events, self._keys)}
+        self.render()
+    
+    def upsert_event(self, event):
+        """Insert or move one event to its sorted position and redraw the visible cards"""
+        self._remove(event['id'])
+        key = event_sort_key(event)
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self.events.insert(index, event)
+        self._key_by_id[event['id']] = key
+        self.render()
+    
+    def remove_event(self, event_id: int):
+        """Drop one event from the list; returns False if it was not shown"""
+        if self._remove(event_id):
+            self.render()
+            return True
+        return False
+    
+    def _remove(self, event_id: int) -> bool:
+        key = self._key_by_id.pop(event_id, None)
+        if key is None:
+            return False
+        index = bisect_left(self._keys, key)
+        del self._keys[index]
+        del self.events[index]
+        return True
+    
+    def render(self):
+        """Bind the visible slice of events to pooled cards and position them"""
+        view_height = max(self.viewport.winfo_height(), 1)
+        total_height = len(self.events) * self.row_height
+        self.scroll_top = max(0, min(self.scroll_top, total_height - view_height))
+        
+        if not self.events:
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+        else:
+            self.empty_label.place_forget()
+        
+        # One card per visible row, plus one for the partially visible row at each edge
+        needed = min(len(self.events), view_height // self.row_height + 2)
+        while len(self.cards) < needed:
+            self.cards.append(EventCard(self.viewport, self.colors, self.CARD_HEIGHT, self.on_select))
+        
+        first = self.scroll_top // self.row_height
+        for slot, card in enumerate(self.cards):
+            index = first + slot
+            if slot < needed and index < len(self.events):
+                card.show_event(self.events[index])
+                y = index * self.row_height - self.scroll_top + self.CARD_SPACING // 2
+                card.frame.place(relx=0.5, y=y, relwidth=0.94, anchor="n")
+            else:
+                card.event = None
+                card.frame.place_forget()
+        
+        if total_height:
+            self.scrollbar.set(self.scroll_top / total_height,
+                               min(1.0, (self.scroll_top + view_height) / total_height))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def scroll_to(self, pixels: int):
+        self.scroll_top = int(pixels)
+        self.render()
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        total_height = len(self.events) * self.row_height
+        if action == "moveto":
+            self.scroll_to(float(value) * total_height)
+        elif action == "scroll":
+            self.scroll_to(self.scroll_top + int(value) * self.WHEEL_STEP)
+    
+    def _on_mouse_wheel(self, event):
+        # Only react when the pointer is over this list
+        if not str(event.widget).startswith(str(self.viewport)):
+            return
+        
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -1 if event.delta > 0 else 1
+        self.scroll_to(self.scroll_top + steps * self.WHEEL_STEP)
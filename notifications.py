@@ -1,17 +1,52 @@
+import heapq
+import itertools
 import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List
-from plyer import notification
-import customtkinter as ctk
-from tkinter import messagebox
+from datetime import datetime, timedelta, time as dt_time
+from typing import Callable, Dict, List
+
+from date_utils import parse_date
+
+# plyer and customtkinter are imported on first use so that starting the
+# notification thread never slows down application launch
 
 class NotificationManager:
-    def __init__(self, db_manager):
+    # Longest single wait between scheduler wake-ups. Keeps the schedule correct
+    # if the wall clock jumps (suspend/resume, DST, manual clock changes).
+    MAX_SLEEP_SECONDS = 3600
+    
+    # The queue only holds events whose first notification falls on or before
+    # the horizon (today + SCHEDULE_AHEAD_DAYS); the horizon moves forward as
+    # the days pass instead of the whole events table being loaded up front
+    SCHEDULE_AHEAD_DAYS = 1
+    
+    # Returned by _next_due after a capped wait, a day change or a bulk change,
+    # to extend or rebuild the schedule and to look for writes made by other
+    # processes (countdown_cli, api_server) that no listener reports
+    RESCAN = ("rescan", None, None)
+    
+    def __init__(self, db_manager, now: Callable[[], datetime] = datetime.now):
         self.db_manager = db_manager
         self.running = False
         self.notification_thread = None
+        # Clock used for scheduling; tests pass a fake one
+        self._now = now
+        
+        # Min-heap of (fire_at, seq, generation, event_id, kind, event); entries
+        # whose generation no longer matches _generations are stale and skipped
+        self._queue = []
+        self._sequence = itertools.count()
+        self._generations = {}
+        self._condition = threading.Condition()
+        # Last day covered by the queue (None until the schedule is loaded)
+        self._horizon = None
+        # Set by a bulk change; the monitor thread rebuilds the queue
+        self._reload_requested = False
+        # The monitor thread's data_version when the schedule was last built
+        self._data_version = None
         
+        self.db_manager.add_change_listener(self._on_event_changed)
+    
     def start_monitoring(self):
         """Start the notification monitoring thread"""
         if not self.running:
@@ -21,38 +56,248 @@ class NotificationManager:
     
     def stop_monitoring(self):
         """Stop the notification monitoring"""
-        self.running = False
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
         if self.notification_thread:
             self.notification_thread.join(timeout=1)
     
-    def _monitor_events(self):
-        """Background thread to monitor events and send notifications"""
-        while self.running:
-            try:
-                events = self.db_manager.get_all_events()
-                current_date = datetime.now().date()
+    # Ledger rows older than this are pruned when the schedule is loaded
+    LEDGER_RETENTION_DAYS = 7
+    
+    def reschedule_event(self, event_id: int):
+        """Re-arm reminders for an event after it was added or edited"""
+        event = self.db_manager.get_event_by_id(event_id)
+        with self._condition:
+            self._generations[event_id] = self._generations.get(event_id, 0) + 1
+            scheduled = []
+            today = self._now().date()
+            # Events beyond the horizon are queued when the horizon reaches them
+            if event and event['is_active'] and self._in_window(event, today):
+                sent = self.db_manager.get_sent_notifications(today.isoformat())
+                horizon = self._horizon.isoformat()
+                scheduled = [entry for entry in self._schedule_event(event, today, sent)
+                             if entry[2] <= horizon]
+            self._condition.notify_all()
+        self.db_manager.record_scheduled_notifications(scheduled)
+    
+    def remove_event(self, event_id: int):
+        """Cancel pending reminders for a deleted event"""
+        with self._condition:
+            self._generations[event_id] = self._generations.get(event_id, 0) + 1
+            self._condition.notify_all()
+    
+    def _on_event_changed(self, action, event_id):
+        """Database change listener: re-arm or cancel one event's reminders"""
+        if action == "reload":
+            # Bulk change: the monitor thread rebuilds the queue, not the
+            # thread that made the change
+            with self._condition:
+                self._reload_requested = True
+                self._condition.notify_all()
+        elif action == "delete":
+            self.remove_event(event_id)
+        elif event_id is not None:
+            self.reschedule_event(event_id)
+    
+    @staticmethod
+    def _first_fire_date(event: Dict):
+        """The day of an event's earliest notification (its reminder, if any)"""
+        event_date = parse_date(event['event_date'])
+        days_before = event['notification_days_before']
+        if days_before and days_before > 0:
+            return event_date - timedelta(days=days_before)
+        return event_date
+    
+    def _in_window(self, event: Dict, today) -> bool:
+        """Whether the queue should hold this event's notifications.
+        
+        Must be called with self._condition held.
+        """
+        if self._horizon is None:
+            return False  # The first load will read it from the database
+        return (self._first_fire_date(event) <= self._horizon
+                and parse_date(event['event_date']) >= today - timedelta(days=1))
+    
+    def _schedule_event(self, event: Dict, today, sent: set) -> List[tuple]:
+        """Push the reminder, event-day and day-after notifications that are still due.
+        
+        Notifications already in the delivery ledger (`sent`) are skipped.
+        Returns the (event_id, notification_type, day) ledger entries queued.
+        Must be called with self._condition held.
+        """
+        if not event['notification_enabled']:
+            return []
+        
+        event_date = parse_date(event['event_date'])
+        days_before = event['notification_days_before']
+        generation = self._generations.get(event['id'], 0)
+        
+        fire_dates = [(event_date, "today"), (event_date + timedelta(days=1), "passed")]
+        if days_before and days_before > 0:
+            fire_dates.append((event_date - timedelta(days=days_before), "reminder"))
+        
+        scheduled = []
+        for fire_date, kind in fire_dates:
+            # Reminders for earlier days are not replayed; today's fire immediately
+            if fire_date < today:
+                continue
+            entry = (event['id'], kind, fire_date.isoformat())
+            if entry in sent:
+                continue
+            fire_at = datetime.combine(fire_date, dt_time.min)
+            heapq.heappush(self._queue, (
+                fire_at, next(self._sequence), generation, event['id'], kind, event
+            ))
+            scheduled.append(entry)
+        return scheduled
+    
+    def _load_schedule(self):
+        """Rebuild the queue from the events that are due by the horizon"""
+        today = self._now().date()
+        self.db_manager.prune_notifications(
+            (today - timedelta(days=self.LEDGER_RETENTION_DAYS)).isoformat()
+        )
+        with self._condition:
+            self._queue = []
+            self._horizon = None
+        self._extend_schedule()
+    
+    def _extend_schedule(self):
+        """Move the horizon up to today + SCHEDULE_AHEAD_DAYS.
+        
+        Queues only the events whose first notification falls after the old
+        horizon and on or before the new one; the ones before it are queued
+        already.
+        """
+        today = self._now().date()
+        horizon = today + timedelta(days=self.SCHEDULE_AHEAD_DAYS)
+        previous = self._horizon
+        if previous is not None and previous >= horizon:
+            return
+        
+        # Day-after notifications reach back one day; reminders reach forward
+        # by the longest lead time
+        start = today - timedelta(days=1)
+        if previous is not None:
+            start = max(start, previous + timedelta(days=1))
+        end = horizon + timedelta(days=self.db_manager.get_max_notification_days_before())
+        events = self.db_manager.get_events_between(start.isoformat(), end.isoformat())
+        sent = self.db_manager.get_sent_notifications(today.isoformat())
+        
+        with self._condition:
+            for event in events:
+                first_fire = self._first_fire_date(event)
+                if first_fire > horizon or (previous is not None and first_fire <= previous):
+                    continue
+                self._schedule_event(event, today, sent)
+            self._horizon = horizon
+            scheduled = self._entries_due(previous, horizon)
+            self._condition.notify_all()
+        self.db_manager.record_scheduled_notifications(scheduled)
+    
+    def _entries_due(self, after, horizon) -> List[tuple]:
+        """Ledger entries for live queued notifications due after `after` (None for
+        no lower bound) and on or before `horizon`.
+        
+        Only these are recorded as pending; the rest get their ledger row when
+        the horizon reaches them or, at the latest, when they are claimed.
+        Must be called with self._condition held.
+        """
+        entries = []
+        for fire_at, _, generation, event_id, kind, _ in self._queue:
+            day = fire_at.date()
+            if (day <= horizon and (after is None or day > after)
+                    and generation == self._generations.get(event_id, 0)):
+                entries.append((event_id, kind, day.isoformat()))
+        return entries
+    
+    def _rescan(self):
+        """Rebuild the queue after a bulk change or a write by another connection;
+        otherwise just extend it to the current horizon"""
+        version = self.db_manager.data_version()
+        with self._condition:
+            reload = self._reload_requested or version != self._data_version
+            self._reload_requested = False
+        self._data_version = version
+        if reload:
+            self._load_schedule()
+        else:
+            self._extend_schedule()
+    
+    def _next_due(self):
+        """Block until the earliest queued notification is due and pop it.
+        
+        Returns RESCAN when a MAX_SLEEP_SECONDS wait runs out, the day has
+        moved past the horizon or a reload was requested, and None once
+        monitoring stops.
+        """
+        with self._condition:
+            while self.running:
+                now = self._now()
+                if self._reload_requested or (
+                        self._horizon is not None
+                        and self._horizon < now.date() + timedelta(days=self.SCHEDULE_AHEAD_DAYS)):
+                    return self.RESCAN
+                
+                if not self._queue:
+                    if not self._condition.wait(self.MAX_SLEEP_SECONDS):
+                        return self.RESCAN
+                    continue
                 
-                for event in events:
-                    if not event['notification_enabled']:
-                        continue
-                    
-                    event_date = datetime.strptime(event['event_date'], "%Y-%m-%d").date()
-                    days_until = (event_date - current_date).days
-                    
-                    # Check if we should send a notification
-                    if days_until == event['notification_days_before']:
-                        self._send_notification(event, days_until)
-                    elif days_until == 0:
-                        self._send_event_today_notification(event)
-                    elif days_until < 0 and days_until == -1:
-                        self._send_event_passed_notification(event)
+                fire_at, _, generation, event_id, kind, event = self._queue[0]
+                if generation != self._generations.get(event_id, 0):
+                    heapq.heappop(self._queue)
+                    continue
                 
-                # Sleep for 1 hour before checking again
-                time.sleep(3600)
+                delay = (fire_at - now).total_seconds()
+                if delay > 0:
+                    notified = self._condition.wait(min(delay, self.MAX_SLEEP_SECONDS))
+                    if not notified and delay > self.MAX_SLEEP_SECONDS:
+                        return self.RESCAN
+                    continue
                 
+                heapq.heappop(self._queue)
+                return kind, event, fire_at.date().isoformat()
+        return None
+    
+    def _monitor_events(self):
+        """Background thread that sleeps until the next reminder is due and sends it"""
+        while self.running:
+            try:
+                self._data_version = self.db_manager.data_version()
+                self._load_schedule()
+                break
             except Exception as e:
                 print(f"Error in notification monitoring: {e}")
                 time.sleep(60)  # Wait 1 minute before retrying
+        
+        while self.running:
+            due = self._next_due()
+            if due is None:
+                break
+            
+            try:
+                if due is self.RESCAN:
+                    self._rescan()
+                else:
+                    self._deliver(*due)
+            except Exception as e:
+                print(f"Error in notification monitoring: {e}")
+    
+    def _deliver(self, kind: str, event: Dict, day: str) -> bool:
+        """Send one due notification unless the delivery ledger already has it"""
+        # Claim in the delivery ledger first so a restart never re-sends it
+        if not self.db_manager.claim_notification(event['id'], kind, day):
+            return False
+        
+        if kind == "reminder":
+            self._send_notification(event, event['notification_days_before'])
+        elif kind == "today":
+            self._send_event_today_notification(event)
+        else:
+            self._send_event_passed_notification(event)
+        return True
     
     def _send_notification(self, event: Dict, days_until: int):
         """Send a countdown notification"""
@@ -81,6 +326,8 @@ class NotificationManager:
     def _show_system_notification(self, title: str, message: str):
         """Show system notification"""
         try:
+            from plyer import notification
+            
             notification.notify(
                 title=title,
                 message=message,
@@ -103,6 +350,8 @@ class CustomNotificationDialog:
     @staticmethod
     def show_countdown_alert(parent, event_name: str, days_remaining: int):
         """Show a custom countdown alert dialog"""
+        import customtkinter as ctk
+        
         dialog = ctk.CTkToplevel(parent)
         dialog.title("Countdown Alert")
         dialog.geometry("350x200")
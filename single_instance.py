@@ -0,0 +1,275 @@
+"""Single-instance lock and local IPC for the desktop app.
+
+The first launch holds an OS file lock for as long as it runs and listens on
+a Unix domain socket (a named pipe on Windows) through
+multiprocessing.connection. A later launch finds the listener, forwards its
+command ("show" the window, or "add" an event) and exits without importing
+the GUI toolkits. The lock is released by the OS when the process dies, so a
+crash never leaves a stale lock behind.
+
+Everything lives in a per-user 0700 directory, the connection info file
+must belong to the current user, and messages are exchanged as JSON, so
+another local user can neither redirect a launch nor make it unpickle
+anything.
+"""
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, List, Optional, Tuple
+
+if sys.platform == "win32":
+    import msvcrt
+    IPC_FAMILY = "AF_PIPE"
+else:
+    import fcntl
+    IPC_FAMILY = "AF_UNIX"
+
+APP_NAME = "countdown-pro"
+
+# How long a launch that lost the lock race waits for the winner to listen
+CONNECT_TIMEOUT = 2.0
+CONNECT_RETRY_INTERVAL = 0.05
+
+# How long a client waits for the running instance to answer a command
+REPLY_TIMEOUT = 5.0
+
+# Commands and replies are single small JSON objects
+MAX_MESSAGE_BYTES = 64 * 1024
+
+ADD_FLAG = "--add"
+
+def instance_dir(name: str = APP_NAME) -> str:
+    """The current user's private directory for the lock, info file and socket.
+    
+    Created with mode 0700 under XDG_RUNTIME_DIR, or the user's cache
+    directory when that is unset (never the shared temp directory).
+    Raises PermissionError if the directory exists but is not private.
+    """
+    if sys.platform == "win32":
+        # Both live in the user's profile
+        base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+        directory = os.path.join(base, name)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+    
+    base = (os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    directory = os.path.join(base, name)
+    os.makedirs(base, mode=0o700, exist_ok=True)
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    
+    info = os.lstat(directory)
+    if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+            or info.st_mode & 0o077):
+        raise PermissionError(f"{directory} is not a private directory owned by this user")
+    return directory
+
+def instance_paths(name: str = APP_NAME) -> Tuple[str, str, str]:
+    """(lock file, connection info file, listener address) for the current user"""
+    directory = instance_dir(name)
+    if sys.platform == "win32":
+        user = os.environ.get("USERNAME", "user")
+        address = rf"\\.\pipe\{name}-{user}"
+    else:
+        address = os.path.join(directory, "ipc.sock")
+    return os.path.join(directory, "instance.lock"), os.path.join(directory, "ipc.json"), address
+
+def read_info(info_path: str) -> Dict:
+    """Load the connection info file, refusing one written by another user"""
+    flags = os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(info_path, flags)
+    with os.fdopen(fd) as f:
+        if sys.platform != "win32":
+            info = os.fstat(fd)
+            if info.st_uid != os.getuid() or info.st_mode & 0o077:
+                raise PermissionError(f"{info_path} is not private to this user")
+        return json.load(f)
+
+def send_message(conn, message: Dict):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+def receive_message(conn) -> Dict:
+    """Read one JSON message (never a pickle) from a connection"""
+    message = json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES).decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("message is not an object")
+    return message
+
+def launch_command(argv: List[str]) -> Tuple[str, Dict]:
+    """The command a launch asks for: ("add", record) for --add NAME DATE, else ("show", {})"""
+    if ADD_FLAG in argv:
+        index = argv.index(ADD_FLAG)
+        values = argv[index + 1:index + 3]
+        if len(values) == 2:
+            return "add", {'name': values[0], 'event_date': values[1]}
+    return "show", {}
+
+def send_command(command: str, payload: Dict = None, name: str = APP_NAME,
+                 timeout: float = 0.0) -> Optional[Dict]:
+    """Send a command to the running instance and return its reply.
+    
+    Returns None if no instance is listening (after retrying for `timeout`
+    seconds). Replies are {'ok': True, 'result': ...} or {'ok': False, 'error': ...}.
+    """
+    try:
+        _, info_path, _ = instance_paths(name)
+    except OSError:
+        return None
+    deadline = time.monotonic() + timeout
+    
+    while True:
+        try:
+            info = read_info(info_path)
+            conn = Client(info['address'], family=IPC_FAMILY, authkey=bytes.fromhex(info['authkey']))
+            break
+        except (OSError, ValueError, TypeError, KeyError, AuthenticationError):
+            # No instance, a stale or foreign info file, or one still starting up
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(CONNECT_RETRY_INTERVAL)
+    
+    with conn:
+        try:
+            send_message(conn, {'command': command, 'payload': payload or {}})
+            if conn.poll(REPLY_TIMEOUT):
+                return receive_message(conn)
+        except (OSError, EOFError, ValueError):
+            pass
+    return {'ok': False, 'error': "the running instance did not answer"}
+
+def forward_launch(argv: List[str], timeout: float = 0.0) -> bool:
+    """Hand this launch's command to a running instance; False if there is none"""
+    command, payload = launch_command(argv)
+    reply = send_command(command, payload, timeout=timeout)
+    if reply is None:
+        return False
+    if not reply.get('ok'):
+        print(f"Countdown Pro: {reply.get('error')}", file=sys.stderr)
+    return True
+
+class SingleInstance:
+    """Hold the per-user instance lock and answer commands from later launches"""
+    
+    def __init__(self, name: str = APP_NAME):
+        self.name = name
+        self.lock_path = self.info_path = self.address = None
+        self._lock_file = None
+        self._listener = None
+        self._handler = None
+    
+    def acquire(self) -> bool:
+        """Take the lock without blocking; False if another instance holds it.
+        
+        If no private directory is available the app runs unguarded (True,
+        without a lock) rather than failing to start.
+        """
+        try:
+            self.lock_path, self.info_path, self.address = instance_paths(self.name)
+            lock_file = open(self.lock_path, "a+b")
+        except OSError as e:
+            print(f"Single-instance check unavailable: {e}")
+            return True
+        try:
+            if sys.platform == "win32":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        
+        self._lock_file = lock_file
+        return True
+    
+    def listen(self, handler: Callable[[str, Dict], object]):
+        """Answer commands on a daemon thread with handler(command, payload).
+        
+        The handler runs on that thread; its return value is sent back as the
+        result and a ValueError as the error message. Does nothing if
+        acquire() could not take the lock file. If the listener cannot be
+        set up, the lock is released and the app runs unguarded.
+        """
+        if self._lock_file is None:
+            return
+        
+        self._handler = handler
+        temp_path = f"{self.info_path}.{os.getpid()}"
+        try:
+            if IPC_FAMILY == "AF_UNIX" and os.path.exists(self.address):
+                os.unlink(self.address)  # Left by an instance that crashed; we hold the lock
+            
+            authkey = os.urandom(32)
+            self._listener = Listener(self.address, family=IPC_FAMILY, authkey=authkey)
+            
+            # Only this user may read the key; publish it atomically
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({'pid': os.getpid(), 'address': self.address, 'authkey': authkey.hex()}, f)
+            os.replace(temp_path, self.info_path)
+        except OSError as e:
+            # E.g. a socket path longer than AF_UNIX allows. Holding the lock
+            # without answering would leave later launches waiting for nothing.
+            print(f"Single-instance listener unavailable: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            self.release()
+            return
+        
+        threading.Thread(target=self._accept_loop, args=(self._listener,), daemon=True).start()
+    
+    def release(self):
+        """Stop listening and give up the lock"""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+            listener.close()
+        
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+    
+    def _accept_loop(self, listener: Listener):
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                return  # Listener closed by release()
+            with conn:
+                self._serve(conn)
+    
+    def _serve(self, conn):
+        try:
+            if not conn.poll(REPLY_TIMEOUT):
+                return
+            message = receive_message(conn)
+            try:
+                payload = message.get('payload') or {}
+                if not isinstance(payload, dict):
+                    raise ValueError("payload is not an object")
+                result = self._handler(message.get('command'), payload)
+                reply = {'ok': True, 'result': result}
+            except ValueError as e:
+                reply = {'ok': False, 'error': str(e)}
+            except Exception as e:
+                print(f"Error handling instance command: {e}")
+                reply = {'ok': False, 'error': "internal error"}
+            send_message(conn, reply)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass  # Client went away or sent something unexpected
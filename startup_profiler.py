@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+PROFILE_FLAG = "--profile-startup"
+
+class StartupProfiler:
+    """Record how long each startup phase takes.
+    
+    Phases are always timed (it costs a couple of perf_counter calls); the
+    report is only printed when the app runs with --profile-startup.
+    """
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.phases = []
+        self.marks = []
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of startup work"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+    
+    def mark(self, name: str):
+        """Record a point in time relative to process start-up"""
+        self.marks.append((name, time.perf_counter() - self.origin))
+    
+    def report(self):
+        """Print the phase breakdown"""
+        print("Startup phases:")
+        for name, seconds in self.phases:
+            print(f"  {name:<24} {seconds * 1000:8.1f} ms")
+        for name, seconds in self.marks:
+            print(f"  @ {name:<22} {seconds * 1000:8.1f} ms after launch")
+        sys.stdout.flush()
+
+def summarize_import_times(importtime_log: str, top: int = 15) -> List[Tuple[str, int]]:
+    """Total cumulative import time (us) per top-level package from `-X importtime` output"""
+    totals: Dict[str, int] = {}
+    
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cumulative = int(cumulative)
+        except ValueError:
+            continue  # header line
+        
+        # Only count imports made directly by the app; nested ones are included
+        # in their parent's cumulative time
+        if name.startswith("  "):
+            continue
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + cumulative
+    
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+def run_profiled(script: str, argv: List[str]) -> int:
+    """Re-run `script` under `python -X importtime` and print both breakdowns"""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", script] + argv,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env
+    )
+    
+    print("Import times (cumulative):")
+    for package, microseconds in summarize_import_times(result.stderr):
+        print(f"  {package:<24} {microseconds / 1000:8.1f} ms")
+    
+    # Pass through anything on stderr that was not import timing
+    errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+    if errors:
+        print("\n".join(errors), file=sys.stderr)
+    return result.returncode
@@ -1,50 +1,188 @@
-import pystray
-from PIL import Image, ImageDraw
 import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+# Default icon colors as RGBA tuples: circle fill, circle outline, text
+ICON_BACKGROUND = (1, 50, 32, 255)
+ICON_OUTLINE = (255, 255, 255, 255)
+ICON_TEXT = (255, 255, 255, 255)
+
+def countdown_icon_text(days_remaining):
+    """Text shown on the tray icon for a day count"""
+    if days_remaining > 999:
+        return "999+"
+    elif days_remaining < 0:
+        return "END"
+    return str(days_remaining)
+
 class SystemTrayManager:
-    def __init__(self, app_callback, quit_callback):
+    ICON_SIZE = 64
+    # Rendered icons kept in the LRU cache
+    ICON_CACHE_SIZE = 64
+    # Texts pre-rendered into the atlas: every displayable day count
+    ATLAS_TEXTS = tuple(str(days) for days in range(1000)) + ("999+", "END")
+    ATLAS_COLUMNS = 32
+    # Minimum seconds between two redraws of the tray icon/tooltip
+    MIN_UPDATE_INTERVAL = 0.25
+    
+    def __init__(self, app_callback, quit_callback, prerender_icons=False):
         self.app_callback = app_callback
         self.quit_callback = quit_callback
         self.icon = None
         self.running = False
+        self.icon_text = None
+        self.prerender_icons = prerender_icons
+        
+        # (text, colors, size) -> image, most recently used last
+        self._icon_cache = OrderedDict()
+        # Atlas of pre-rendered default icons: one sheet plus text -> cell offset
+        self._atlas = None
+        self._atlas_cells = {}
+        self._icon_lock = threading.Lock()
+        
+        # Latest requested tray state ('days_remaining' / 'title'), applied by
+        # the single consumer running on the tray side. Newer requests
+        # overwrite older ones, so a burst collapses into one redraw.
+        self._pending_updates = {}
+        self._updates = threading.Condition()
+    
+    def create_icon_image(self, text="CD", size=None, background=ICON_BACKGROUND,
+                          outline=ICON_OUTLINE, text_color=ICON_TEXT):
+        """Return the icon image for `text`, rendering it only on a cache miss"""
+        size = size or self.ICON_SIZE
+        key = (text, background, outline, text_color, size)
+        
+        with self._icon_lock:
+            image = self._icon_cache.get(key)
+            if image is not None:
+                self._icon_cache.move_to_end(key)
+                return image
+            
+            # The atlas only holds icons in the default colors and size
+            cell = self._atlas_cells.get(text)
+            if cell is not None and key[1:] == (ICON_BACKGROUND, ICON_OUTLINE, ICON_TEXT, self.ICON_SIZE):
+                x, y = cell
+                image = self._atlas.crop((x, y, x + size, y + size))
+        
+        if image is None:
+            image = self.render_icon_image(text, size, background, outline, text_color)
         
-    def create_icon_image(self, text="CD"):
+        with self._icon_lock:
+            self._icon_cache[key] = image
+            self._icon_cache.move_to_end(key)
+            while len(self._icon_cache) > self.ICON_CACHE_SIZE:
+                self._icon_cache.popitem(last=False)
+        return image
+    
+    def render_icon_image(self, text="CD", size=None, background=ICON_BACKGROUND,
+                          outline=ICON_OUTLINE, text_color=ICON_TEXT):
         """Create a simple icon image with text"""
-        # Create a 64x64 image with transparent background
-        image = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+        from PIL import Image, ImageDraw
+        
+        size = size or self.ICON_SIZE
+        
+        # Create the image with a transparent background
+        image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
         draw = ImageDraw.Draw(image)
         
         # Draw a circle background
-        draw.ellipse([8, 8, 56, 56], fill=(1, 50, 32, 255), outline=(255, 255, 255, 255), width=2)
+        margin = size // 8
+        draw.ellipse([margin, margin, size - margin, size - margin],
+                     fill=background, outline=outline, width=max(1, size // 32))
         
         # Draw text
         bbox = draw.textbbox((0, 0), text, anchor="mm")
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
-        x = (64 - text_width) // 2
-        y = (64 - text_height) // 2
-        draw.text((x, y), text, fill=(255, 255, 255, 255))
+        x = (size - text_width) // 2
+        y = (size - text_height) // 2
+        draw.text((x, y), text, fill=text_color)
         
         return image
     
+    def prerender_icon_atlas(self):
+        """Render every countdown icon into one sheet so later updates never draw"""
+        from PIL import Image
+        
+        size = self.ICON_SIZE
+        columns = self.ATLAS_COLUMNS
+        rows = -(-len(self.ATLAS_TEXTS) // columns)
+        atlas = Image.new('RGBA', (columns * size, rows * size), (0, 0, 0, 0))
+        cells = {}
+        
+        for index, text in enumerate(self.ATLAS_TEXTS):
+            if not self.running:
+                return  # Tray stopped while rendering
+            x, y = (index % columns) * size, (index // columns) * size
+            atlas.paste(self.render_icon_image(text, size), (x, y))
+            cells[text] = (x, y)
+        
+        with self._icon_lock:
+            self._atlas = atlas
+            self._atlas_cells = cells
+    
     def update_icon_with_countdown(self, days_remaining):
-        """Update the system tray icon with countdown days"""
-        if self.icon and self.running:
-            # Limit text length for icon
-            if days_remaining > 999:
-                text = "999+"
-            elif days_remaining < 0:
-                text = "END"
-            else:
-                text = str(days_remaining)
+        """Queue a tray icon update with countdown days (safe from any thread)"""
+        self.request_update(days_remaining=days_remaining)
+    
+    def update_title(self, title):
+        """Queue a tray tooltip update (safe from any thread)"""
+        self.request_update(title=title)
+    
+    def request_update(self, **state):
+        """Record the latest tray state and wake the update consumer"""
+        with self._updates:
+            self._pending_updates.update(state)
+            self._updates.notify()
+    
+    def _run_update_consumer(self, icon):
+        """pystray setup callback: apply queued updates until the tray stops.
+        
+        pystray runs this in its own thread once the icon is created, so all
+        changes to icon.icon and icon.title happen here and never race with
+        the Tk thread.
+        """
+        icon.visible = True
+        last_update = 0.0
+        
+        while self.running:
+            with self._updates:
+                while self.running and not self._pending_updates:
+                    self._updates.wait()
+                if not self.running:
+                    return
+            
+            # Rate limit: let further requests coalesce until the interval is up
+            delay = last_update + self.MIN_UPDATE_INTERVAL - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            
+            with self._updates:
+                updates, self._pending_updates = self._pending_updates, {}
             
-            new_image = self.create_icon_image(text)
-            self.icon.icon = new_image
+            try:
+                self._apply_updates(icon, updates)
+            except Exception as e:
+                print(f"Failed to update tray icon: {e}")
+            last_update = time.monotonic()
+    
+    def _apply_updates(self, icon, updates):
+        """Apply one coalesced update, skipping values already shown"""
+        if 'days_remaining' in updates:
+            # Limit text length for icon
+            text = countdown_icon_text(updates['days_remaining'])
+            if text != self.icon_text:
+                icon.icon = self.create_icon_image(text)
+                self.icon_text = text
+        
+        if 'title' in updates and updates['title'] != icon.title:
+            icon.title = updates['title']
     
     def create_menu(self):
         """Create the system tray context menu"""
+        import pystray
+        
         return pystray.Menu(
             pystray.MenuItem("Open Countdown Widget", self.show_app),
             pystray.MenuItem("Add New Event", self.add_new_event),
@@ -84,8 +222,12 @@ class SystemTrayManager:
     def start(self):
         """Start the system tray icon"""
         if not self.running:
+            # Imported here so pystray's backend only loads once the tray is started
+            import pystray
+            
             self.running = True
-            image = self.create_icon_image()
+            self.icon_text = "CD"
+            image = self.create_icon_image(self.icon_text)
             menu = self.create_menu()
             
             self.icon = pystray.Icon(
@@ -95,17 +237,24 @@ class SystemTrayManager:
                 menu
             )
             
-            # Run in separate thread to avoid blocking
+            # Run in separate thread to avoid blocking; the setup callback
+            # applies queued icon/tooltip updates on the tray side
             self.tray_thread = threading.Thread(
                 target=self.icon.run,
+                kwargs={'setup': self._run_update_consumer},
                 daemon=True
             )
             self.tray_thread.start()
+            
+            if self.prerender_icons and self._atlas is None:
+                threading.Thread(target=self.prerender_icon_atlas, daemon=True).start()
     
     def stop(self):
         """Stop the system tray icon"""
         if self.icon and self.running:
-            self.running = False
+            with self._updates:
+                self.running = False
+                self._updates.notify_all()
             self.icon.stop()
 
 class TrayNotificationManager:
@@ -130,4 +279,4 @@ class TrayNotificationManager:
             else:
                 tooltip = "Countdown Widget - No active events"
             
-            self.tray_manager.icon.title = tooltip
+            self.tray_manager.update_title(tooltip)
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """A DatabaseManager on an empty database in a temporary directory"""
+    manager = DatabaseManager(str(tmp_path / "events.db"))
+    yield manager
+    manager.close()
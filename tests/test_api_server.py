@@ -0,0 +1,172 @@
+import asyncio
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+from api_server import ApiServer
+
+@pytest.fixture
+def api(db_manager):
+    """An ApiServer on a free local port, served from a background event loop"""
+    loop = asyncio.new_event_loop()
+    server = ApiServer(db_manager, port=0)
+    started = threading.Event()
+    
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(server.close())
+        # Finish handlers still waiting on keep-alive connections before closing the loop
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(asyncio.sleep(0))
+        db_manager.release_connection()
+        loop.close()
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield server
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+@pytest.fixture
+def client(api):
+    conn = http.client.HTTPConnection("127.0.0.1", api.port, timeout=5)
+    yield conn
+    conn.close()
+
+def request(client, method, target, body=None, headers=None):
+    """Send a request; returns (status, headers, decoded JSON body or None)"""
+    headers = dict(headers or {})
+    if body is not None:
+        body = json.dumps(body).encode("utf-8")
+        headers['Content-Type'] = "application/json"
+    client.request(method, target, body=body, headers=headers)
+    response = client.getresponse()
+    data = response.read()
+    return response.status, response.headers, json.loads(data) if data else None
+
+def add_event(client, **fields):
+    record = {'name': "Launch", 'event_date': "2030-03-01"}
+    record.update(fields)
+    status, headers, event = request(client, "POST", "/events", record)
+    assert status == 201
+    assert headers['Location'] == f"/events/{event['id']}"
+    return event
+
+def test_post_and_get_round_trip(client):
+    event = add_event(client, description="Ship it", priority="critical")
+    assert event['priority'] == 4 and event['days_remaining'] > 0
+    
+    status, _, fetched = request(client, "GET", f"/events/{event['id']}")
+    assert status == 200 and fetched == event
+    assert request(client, "GET", "/events")[2] == [event]
+    assert request(client, "GET", "/events/next")[2] == event
+    assert request(client, "GET", "/events/upcoming?limit=5")[2] == [event]
+    assert request(client, "GET", "/stats")[2]['total'] == 1
+
+def test_etag_revalidation(client):
+    status, headers, _ = request(client, "GET", "/events")
+    etag = headers['ETag']
+    assert status == 200
+    
+    status, headers, body = request(client, "GET", "/events", headers={'If-None-Match': etag})
+    assert (status, headers['ETag'], body) == (304, etag, None)
+    
+    add_event(client)
+    status, headers, events = request(client, "GET", "/events", headers={'If-None-Match': etag})
+    assert status == 200 and headers['ETag'] != etag and len(events) == 1
+
+def test_etag_changes_after_writes_from_another_connection(api, client, tmp_path):
+    _, headers, _ = request(client, "GET", "/events")
+    
+    other = type(api.db_manager)(str(tmp_path / "events.db"))
+    try:
+        other.add_event("Elsewhere", "2030-01-01")
+    finally:
+        other.close()
+    
+    # Wait for the data_version watcher to notice the commit
+    for _ in range(50):
+        status, _, events = request(client, "GET", "/events", headers={'If-None-Match': headers['ETag']})
+        if status == 200:
+            break
+        time.sleep(0.05)
+    assert status == 200 and [event['name'] for event in events] == ["Elsewhere"]
+
+def test_patch_validates_the_merged_event(client):
+    event = add_event(client)
+    status, _, updated = request(client, "PATCH", f"/events/{event['id']}", {'name': "Renamed"})
+    assert status == 200 and updated['name'] == "Renamed" and updated['event_date'] == "2030-03-01"
+    
+    status, _, body = request(client, "PATCH", f"/events/{event['id']}", {'event_date': "03/01/2030"})
+    assert status == 400 and "error" in body
+    status, _, _ = request(client, "PATCH", f"/events/{event['id']}", ["not", "an", "object"])
+    assert status == 400
+    assert request(client, "GET", f"/events/{event['id']}")[2]['name'] == "Renamed"
+
+def test_delete(client):
+    first = add_event(client)
+    second = add_event(client, name="Second")
+    
+    status, _, body = request(client, "DELETE", f"/events/{first['id']}")
+    assert (status, body) == (204, None)
+    assert request(client, "GET", "/events")[2] == [second]
+    assert request(client, "GET", "/events?all=1")[2][0]['is_active'] == 0
+    
+    status, _, _ = request(client, "DELETE", f"/events/{first['id']}?hard=1")
+    assert status == 204
+    assert request(client, "GET", f"/events/{first['id']}")[0] == 404
+
+def test_date_window(client):
+    add_event(client, name="Early", event_date="2030-01-01")
+    add_event(client, name="Late", event_date="2031-01-01")
+    status, _, events = request(client, "GET", "/events?from=2030-06-01&to=2031-06-01")
+    assert status == 200 and [event['name'] for event in events] == ["Late"]
+
+@pytest.mark.parametrize("method, target, body, expected", [
+    ("GET", "/events/999", None, 404),
+    ("PATCH", "/events/999", {'name': "x"}, 404),
+    ("DELETE", "/events/999", None, 404),
+    ("GET", "/nowhere", None, 404),
+    ("GET", "/events/abc", None, 404),
+    ("PUT", "/events", {'name': "x"}, 405),
+    ("DELETE", "/events", None, 405),
+    ("GET", "/events?from=2030-13-01", None, 400),
+    ("GET", "/events/upcoming?limit=ten", None, 400),
+    ("POST", "/events", {'name': "No date"}, 400),
+    ("POST", "/events", {'name': "x", 'event_date': "2030-01-01", 'priority': 9}, 400),
+])
+def test_error_responses(client, method, target, body, expected):
+    status, _, payload = request(client, method, target, body)
+    assert status == expected and isinstance(payload['error'], str)
+
+def test_invalid_json_body(client):
+    client.request("POST", "/events", body=b"{not json", headers={'Content-Type': "application/json"})
+    response = client.getresponse()
+    assert response.status == 400 and "error" in json.loads(response.read())
+    
+    # The connection stays usable after an error
+    assert request(client, "GET", "/events")[0] == 200
+
+@pytest.mark.parametrize("value", ["false", "true", "0", None, 2, 0.0])
+def test_patch_rejects_non_boolean_is_active(client, value):
+    event = add_event(client)
+    request(client, "DELETE", f"/events/{event['id']}")
+    status, _, body = request(client, "PATCH", f"/events/{event['id']}", {'is_active': value})
+    assert status == 400 and "is_active" in body['error']
+    assert request(client, "GET", f"/events/{event['id']}")[2]['is_active'] == 0
+
+def test_patch_restores_with_boolean_is_active(client):
+    event = add_event(client)
+    request(client, "DELETE", f"/events/{event['id']}")
+    status, _, restored = request(client, "PATCH", f"/events/{event['id']}", {'is_active': True})
+    assert status == 200 and restored['is_active'] == 1
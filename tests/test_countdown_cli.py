@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+from countdown_cli import main
+
+def test_add_and_list_json(tmp_path, capsys):
+    db = str(tmp_path / "events.db")
+    assert main(["--db", db, "add", "Launch", "2030-03-01", "--priority", "high", "--json"]) == 0
+    added = json.loads(capsys.readouterr().out)
+    assert (added['name'], added['priority']) == ("Launch", 3)
+    
+    assert main(["--db", db, "list", "--upcoming", "--json"]) == 0
+    assert [json.loads(line)['id'] for line in capsys.readouterr().out.splitlines()] == [added['id']]
+
+def test_list_rejects_upcoming_with_all(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--db", str(tmp_path / "events.db"), "list", "--upcoming", "--all"])
+    assert exit_info.value.code == 2
+    assert "not allowed with" in capsys.readouterr().err
@@ -0,0 +1,111 @@
+import sqlite3
+
+import pytest
+
+from database import SCHEMA_VERSION, DatabaseManager, event_values_from_record
+
+OLD_SCHEMA = '''
+    CREATE TABLE events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT,
+        event_date DATE NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_active INTEGER DEFAULT 1,
+        notification_enabled INTEGER DEFAULT 1,
+        notification_days_before INTEGER DEFAULT 1,
+        theme_color TEXT DEFAULT '#013220',
+        priority INTEGER DEFAULT 1
+    );
+    CREATE TABLE notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id INTEGER,
+        notification_type TEXT,
+        notification_time TIMESTAMP,
+        is_sent INTEGER DEFAULT 0,
+        FOREIGN KEY (event_id) REFERENCES events (id)
+    );
+    CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT);
+'''
+
+def test_migrates_unversioned_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SCHEMA)
+    conn.execute("INSERT INTO events (name, event_date) VALUES ('Kept', '2030-01-01')")
+    # Duplicate ledger rows from before the delivery ledger was unique
+    conn.executemany(
+        "INSERT INTO notifications (event_id, notification_type, notification_time, is_sent) "
+        "VALUES (1, 'today', '2030-01-01', ?)", [(1,), (0,)]
+    )
+    conn.commit()
+    conn.close()
+    
+    db_manager = DatabaseManager(path)
+    try:
+        conn = db_manager._get_connection()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_events_active_date", "idx_notifications_event_sent",
+                "idx_notifications_delivery", "idx_events_upcoming"} <= indexes
+        assert conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0] == 1
+        assert [event['name'] for event in db_manager.get_all_events()] == ["Kept"]
+    finally:
+        db_manager.close()
+
+def test_reopening_current_database_is_a_no_op(tmp_path):
+    path = str(tmp_path / "events.db")
+    DatabaseManager(path).close()
+    db_manager = DatabaseManager(path)
+    try:
+        assert db_manager.data_version() >= 0
+        assert all(result['uses_index'] for result in db_manager.explain_query_plans().values())
+    finally:
+        db_manager.close()
+
+def test_next_upcoming_event_sees_other_connections(tmp_path):
+    path = str(tmp_path / "events.db")
+    first = DatabaseManager(path)
+    second = DatabaseManager(path)
+    try:
+        first.add_event("Later", "2040-01-01")
+        assert first.get_next_upcoming_event()['name'] == "Later"
+        second.add_event("Sooner", "2035-01-01")
+        assert first.get_next_upcoming_event()['name'] == "Sooner"
+    finally:
+        first.close()
+        second.close()
+
+@pytest.mark.parametrize("value, expected", [
+    (True, 1), (False, 0), (1, 1), (0, 0), ("true", 1), ("FALSE", 0), (" True ", 1)])
+def test_notification_enabled_flags(value, expected):
+    values = event_values_from_record({'name': "x", 'event_date': "2030-01-01",
+                                       'notification_enabled': value})
+    assert values[3] == expected
+
+@pytest.mark.parametrize("value", ["no", "0", "yes", "", 2, None, 1.0])
+def test_notification_enabled_rejects_other_values(value):
+    with pytest.raises(ValueError, match="notification_enabled"):
+        event_values_from_record({'name': "x", 'event_date': "2030-01-01",
+                                  'notification_enabled': value})
+
+def test_bulk_import_reports_bad_flags(db_manager):
+    imported, errors = db_manager.bulk_add_events([
+        {'name': "on", 'event_date': "2030-01-01", 'notification_enabled': "true"},
+        {'name': "off", 'event_date': "2030-01-01", 'notification_enabled': "false"},
+        {'name': "bad", 'event_date': "2030-01-01", 'notification_enabled': "no"},
+    ])
+    assert imported == 2 and [index for index, _ in errors] == [2]
+    assert {event['name']: event['notification_enabled']
+            for event in db_manager.get_all_events()} == {"on": 1, "off": 0}
+
+def test_add_event_from_record(db_manager):
+    event_id = db_manager.add_event_from_record({'name': " Launch ", 'event_date': "2030-03-01",
+                                                 'priority': "urgent", 'notification_enabled': False})
+    event = db_manager.get_event_by_id(event_id)
+    assert (event['name'], event['priority'], event['notification_enabled']) == ("Launch", 5, 0)
+    
+    with pytest.raises(ValueError):
+        db_manager.add_event_from_record({'name': "No date"})
+    assert db_manager.count_events() == 1
@@ -0,0 +1,143 @@
+import io
+import json
+
+import pytest
+
+import event_io
+from event_io import (export_events_file, import_events_file, read_csv, read_json,
+                      read_ndjson, write_csv, write_json, write_ndjson)
+
+def add_sample_events(db_manager):
+    db_manager.add_event("Launch", "2030-03-01", "Ship it, finally", priority=3)
+    db_manager.add_event("Café \"opening\"", "2030-01-15", "line one\nline two",
+                         notification_days_before=7, priority=5)
+    db_manager.add_event("Review", "2031-06-30", notification_enabled=False)
+
+def exported(events):
+    return [event.copy() for event in events]
+
+def test_write_json_matches_json_dump(db_manager):
+    add_sample_events(db_manager)
+    events = db_manager.get_all_events()
+    f = io.StringIO()
+    for _ in write_json(events, f):
+        pass
+    assert f.getvalue() == json.dumps(exported(events), indent=2)
+
+def test_write_json_empty():
+    f = io.StringIO()
+    assert list(write_json([], f)) == []
+    assert f.getvalue() == "[]"
+
+@pytest.mark.parametrize("read_size", [1, 3, 7, 64 * 1024])
+def test_read_json_across_read_boundaries(monkeypatch, read_size):
+    records = [{"name": f"é{i}", "event_date": "2030-01-01", "description": "a\\b☃",
+                "flags": [True, False, None, -1.5e3]} for i in range(50)]
+    monkeypatch.setattr(event_io, "READ_SIZE", read_size)
+    assert list(read_json(io.StringIO(json.dumps(records, indent=2)))) == records
+
+def test_read_json_single_object():
+    assert list(read_json(io.StringIO('{"name": "x"}'))) == [{"name": "x"}]
+
+def test_read_json_raises_early_syntax_error_without_reading_everything():
+    text = json.dumps([{"name": f"e{i}", "event_date": "2030-01-01"} for i in range(20000)], indent=2)
+    reads = []
+    
+    class Counting(io.StringIO):
+        def read(self, size=-1):
+            reads.append(size)
+            return super().read(size)
+    
+    with pytest.raises(json.JSONDecodeError):
+        list(read_json(Counting(text[:100] + "}}}" + text[100:])))
+    assert len(reads) == 1
+
+def test_read_json_truncated_file():
+    with pytest.raises(json.JSONDecodeError):
+        list(read_json(io.StringIO('[{"name": "x"}, {"name": "y"')))
+
+def test_ndjson_round_trip(db_manager):
+    add_sample_events(db_manager)
+    events = db_manager.get_all_events()
+    f = io.StringIO()
+    assert list(write_ndjson(events, f))[-1] == 3
+    assert list(read_ndjson(io.StringIO(f.getvalue()))) == exported(events)
+
+def test_ndjson_skips_blank_lines_and_reports_bad_line():
+    assert list(read_ndjson(io.StringIO('{"a": 1}\n\n{"a": 2}\n'))) == [{"a": 1}, {"a": 2}]
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_ndjson(io.StringIO('{"a": 1}\n{"a": \n')))
+
+def test_csv_round_trip_restores_integers(db_manager):
+    add_sample_events(db_manager)
+    events = db_manager.get_all_events()
+    f = io.StringIO(newline="")
+    for _ in write_csv(events, f):
+        pass
+    records = {record['name']: record for record in read_csv(io.StringIO(f.getvalue(), newline=""))}
+    opening = records['Café "opening"']
+    assert opening['description'] == "line one\nline two"
+    assert opening['priority'] == 5 and opening['notification_days_before'] == 7
+    # Empty cells are dropped so they fall back to defaults on import
+    assert 'description' not in records['Review']
+    launch = next(event for event in exported(events) if event['name'] == "Launch")
+    assert records['Launch'] == launch
+
+def test_csv_leaves_bad_integers_for_validation():
+    records = list(read_csv(io.StringIO("name,event_date,priority\nx,2030-01-01,high\ny,2030-01-01,2\n")))
+    assert records == [{'name': "x", 'event_date': "2030-01-01", 'priority': "high"},
+                       {'name': "y", 'event_date': "2030-01-01", 'priority': 2}]
+
+@pytest.mark.parametrize("extension", [".json", ".ndjson", ".csv", ".ics"])
+def test_file_round_trip(db_manager, tmp_path, extension):
+    add_sample_events(db_manager)
+    filename = str(tmp_path / f"events{extension}")
+    assert export_events_file(db_manager, filename) == 3
+    assert not (tmp_path / f"events{extension}.part").exists()
+    
+    target = type(db_manager)(str(tmp_path / "target.db"))
+    try:
+        assert import_events_file(target, filename) == (3, [])
+        fields = ('name', 'description', 'event_date', 'priority')
+        assert ([tuple(e[f] for f in fields) for e in target.get_all_events()]
+                == [tuple(e[f] for f in fields) for e in db_manager.get_all_events()])
+    finally:
+        target.close()
+
+def test_import_reports_invalid_records(db_manager, tmp_path):
+    path = tmp_path / "events.ndjson"
+    path.write_text('{"name": "ok", "event_date": "2030-01-01"}\n'
+                    '{"name": "no date"}\n'
+                    '{"name": "bad", "event_date": "2030-01-01", "priority": 9}\n')
+    imported, errors = import_events_file(db_manager, str(path))
+    assert imported == 1
+    assert [index for index, _ in errors] == [1, 2]
+
+def test_failed_export_leaves_no_file(db_manager, tmp_path, monkeypatch):
+    add_sample_events(db_manager)
+    monkeypatch.setattr(event_io, "PROGRESS_EVERY", 1)
+    filename = tmp_path / "events.json"
+    
+    def stop(done, total):
+        raise RuntimeError("stop")
+    
+    with pytest.raises(RuntimeError):
+        export_events_file(db_manager, str(filename), progress=stop)
+    assert not filename.exists() and not (tmp_path / "events.json.part").exists()
+
+def test_csv_import_skips_byte_order_mark(db_manager, tmp_path):
+    path = tmp_path / "excel.csv"
+    path.write_bytes("name,event_date,priority\r\nCafé,2030-01-01,high\r\n".encode("utf-8-sig"))
+    assert import_events_file(db_manager, str(path)) == (1, [])
+    event = db_manager.get_all_events()[0]
+    assert (event['name'], event['priority']) == ("Café", 3)
+
+def test_csv_notification_flags(db_manager, tmp_path):
+    path = tmp_path / "flags.csv"
+    path.write_text("name,event_date,notification_enabled\n"
+                    "a,2030-01-01,false\nb,2030-01-01,TRUE\nc,2030-01-01,0\nd,2030-01-01,no\n")
+    imported, errors = import_events_file(db_manager, str(path))
+    assert imported == 3
+    assert [index for index, _ in errors] == [3] and "notification_enabled" in errors[0][1]
+    assert {event['name']: event['notification_enabled']
+            for event in db_manager.get_all_events()} == {"a": 0, "b": 1, "c": 0}
@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+from event_io import (EVENT_PRIORITY_TO_ICS, ICS_LINE_OCTETS, ics_content_lines, ics_escape,
+                      ics_fold, ics_split_property, ics_unescape, read_ics, write_ics)
+
+def write_events(events) -> str:
+    f = io.StringIO(newline="")
+    for _ in write_ics(events, f):
+        pass
+    return f.getvalue()
+
+def read_events(text: str):
+    return list(read_ics(io.StringIO(text, newline="")))
+
+def event(event_id=1, name="Launch", event_date="2030-03-01", description="", priority=1):
+    return {'id': event_id, 'name': name, 'event_date': event_date,
+            'description': description, 'priority': priority}
+
+@pytest.mark.parametrize("text", ["plain", "a,b;c\\d", "line one\nline two", "trailing \\",
+                                  "\\n is not a newline"])
+def test_escape_round_trip(text):
+    assert ics_unescape(ics_escape(text)) == text
+
+def test_escape_and_unescape():
+    assert ics_escape("a,b;c\\d\r\ne") == "a\\,b\\;c\\\\d\\ne"
+    assert ics_unescape("one\\Ntwo\\nthree\\,\\;") == "one\ntwo\nthree,;"
+
+@pytest.mark.parametrize("line", ["SUMMARY:" + "x" * 200, "SUMMARY:" + "é" * 100,
+                                  "SUMMARY:" + "☃🎉a" * 40, "SUMMARY:short"])
+def test_fold_limits_octets_and_unfolds(line):
+    folded = ics_fold(line)
+    assert folded.endswith("\r\n")
+    for part in folded[:-2].split("\r\n"):
+        assert len(part.encode("utf-8")) <= ICS_LINE_OCTETS
+    assert list(ics_content_lines(io.StringIO(folded, newline=""))) == [line]
+
+def test_content_lines_unfold_tabs_and_skip_blank_lines():
+    text = "BEGIN:VEVENT\r\nSUMMARY:Lo\r\n\tng\r\n\r\nEND:VEVENT\r\n"
+    assert list(ics_content_lines(io.StringIO(text, newline=""))) == [
+        "BEGIN:VEVENT", "SUMMARY:Long", "END:VEVENT"]
+
+def test_split_property():
+    assert ics_split_property("dtstart;VALUE=DATE:20300301") == ("DTSTART", "VALUE=DATE", "20300301")
+    assert ics_split_property('ATTENDEE;CN="Doe: J":mailto:j@example.com') == (
+        "ATTENDEE", 'CN="Doe: J"', "mailto:j@example.com")
+    assert ics_split_property("no colon") == (None, "", "")
+
+@pytest.mark.parametrize("ics_priority, expected", [
+    (0, None), (1, 5), (2, 4), (3, 3), (4, 3), (5, 2), (6, 1), (9, 1), (10, None), ("x", None)])
+def test_priority_mapping(ics_priority, expected):
+    records = read_events("BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nSUMMARY:x\r\n"
+                          f"DTSTART:20300301\r\nPRIORITY:{ics_priority}\r\n"
+                          "END:VEVENT\r\nEND:VCALENDAR\r\n")
+    assert records[0].get('priority') == expected
+
+def test_priorities_survive_a_round_trip():
+    events = [event(level, priority=level) for level in EVENT_PRIORITY_TO_ICS]
+    assert [record['priority'] for record in read_events(write_events(events))] == list(EVENT_PRIORITY_TO_ICS)
+
+def test_round_trip_with_long_escaped_text():
+    description = "Notes, with; special\\chars\nand a second line " + "ünïcode ☃ " * 30
+    original = event(name="Café, \"grand\" opening", description=description, priority=4)
+    text = write_events([original])
+    
+    assert all(len(line.encode("utf-8")) <= ICS_LINE_OCTETS for line in text.split("\r\n"))
+    assert read_events(text) == [{'name': original['name'], 'description': description,
+                                  'event_date': "2030-03-01", 'priority': 4}]
+
+def test_date_times_keep_the_date_and_alarms_are_ignored():
+    text = ("BEGIN:VCALENDAR\r\n"
+            "BEGIN:VEVENT\r\n"
+            "SUMMARY:Meeting\r\n"
+            "DTSTART;TZID=Europe/Paris:20300712T100000\r\n"
+            "BEGIN:VALARM\r\n"
+            "DESCRIPTION:Reminder\r\n"
+            "PRIORITY:1\r\n"
+            "END:VALARM\r\n"
+            "END:VEVENT\r\n"
+            "SUMMARY:Outside any event\r\n"
+            "END:VCALENDAR\r\n")
+    assert read_events(text) == [{'name': "Meeting", 'event_date': "2030-07-12"}]
+
+def test_empty_calendar():
+    text = write_events([])
+    assert text.startswith("BEGIN:VCALENDAR\r\n") and text.endswith("END:VCALENDAR\r\n")
+    assert read_events(text) == []
@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pytest
+
+from database import DatabaseManager
+from notifications import NotificationManager
+
+class FakeClock:
+    def __init__(self, now: str):
+        self.set(now)
+    
+    def set(self, now: str):
+        self.now = datetime.fromisoformat(now)
+    
+    def __call__(self) -> datetime:
+        return self.now
+
+class Monitor:
+    """A NotificationManager driven by hand instead of by its thread"""
+    
+    def __init__(self, db_manager, clock):
+        self.manager = NotificationManager(db_manager, now=clock)
+        # Never block: waits time out at once and come back as RESCAN
+        self.manager.MAX_SLEEP_SECONDS = 0
+        self.manager.running = True
+        self.shown = []
+        self.manager._show_system_notification = lambda title, message: self.shown.append(message)
+        self.manager._data_version = db_manager.data_version()
+        self.manager._load_schedule()
+    
+    def wake(self):
+        """One capped wake-up: rescan, then deliver everything due; returns what was shown"""
+        self.manager._rescan()
+        start = len(self.shown)
+        while True:
+            due = self.manager._next_due()
+            if due is NotificationManager.RESCAN:
+                return self.shown[start:]
+            self.manager._deliver(*due)
+
+@pytest.fixture
+def clock():
+    return FakeClock("2030-01-06T12:00:00")
+
+def pending_rows(db_manager):
+    conn = db_manager._get_connection()
+    return conn.execute("SELECT event_id, notification_type, notification_time FROM notifications "
+                        "WHERE is_sent = 0 ORDER BY notification_time").fetchall()
+
+def test_reminder_fires_exactly_once(db_manager, clock):
+    db_manager.add_event("Launch", "2030-01-10", notification_days_before=3)
+    monitor = Monitor(db_manager, clock)
+    assert monitor.wake() == []
+    
+    clock.set("2030-01-07T00:00:01")
+    assert monitor.wake() == ["3 days remaining until Launch!"]
+    assert monitor.wake() == []
+    
+    clock.set("2030-01-10T08:00:00")
+    assert monitor.wake() == ["Today is Launch!"]
+    clock.set("2030-01-11T08:00:00")
+    assert monitor.wake() == ["Launch was yesterday. Hope it went well!"]
+    assert monitor.wake() == []
+
+def test_restart_does_not_resend(db_manager, clock, tmp_path):
+    db_manager.add_event("Launch", "2030-01-08", notification_days_before=1)
+    clock.set("2030-01-07T09:00:00")
+    assert Monitor(db_manager, clock).wake() == ["Tomorrow is Launch!"]
+    
+    # A new process on the same database file
+    restarted = DatabaseManager(str(tmp_path / "events.db"))
+    try:
+        assert Monitor(restarted, clock).wake() == []
+    finally:
+        restarted.close()
+
+def test_edit_from_another_connection_is_rescheduled(db_manager, clock, tmp_path):
+    event_id = db_manager.add_event("Launch", "2030-03-01", notification_days_before=1)
+    monitor = Monitor(db_manager, clock)
+    
+    other = DatabaseManager(str(tmp_path / "events.db"))
+    try:
+        other.update_event(event_id, event_date="2030-01-08")
+    finally:
+        other.close()
+    # No listener hears about it; the rescan notices data_version change
+    assert monitor.wake() == []
+    
+    clock.set("2030-01-07T00:00:01")
+    assert monitor.wake() == ["Tomorrow is Launch!"]
+    clock.set("2030-02-28T12:00:00")
+    assert "Tomorrow is Launch!" not in monitor.wake()
+
+def test_only_notifications_due_by_the_horizon_are_queued(db_manager, clock):
+    near = db_manager.add_event("Near", "2030-01-07", notification_days_before=0)
+    far = db_manager.add_event("Far", "2030-02-01", notification_days_before=3)
+    monitor = Monitor(db_manager, clock)
+    
+    assert {entry[3] for entry in monitor.manager._queue} == {near}
+    assert pending_rows(db_manager) == [(near, "today", "2030-01-07")]
+    
+    clock.set("2030-01-29T00:00:01")
+    assert monitor.wake() == ["Today is Near!", "Near was yesterday. Hope it went well!",
+                              "3 days remaining until Far!"]
+    assert (far, "today", "2030-02-01") not in pending_rows(db_manager)
+
+def test_bulk_changes_reload_on_the_monitor_thread(db_manager, clock):
+    monitor = Monitor(db_manager, clock)
+    db_manager.bulk_add_events([{'name': "Imported", 'event_date': "2030-01-07",
+                                 'notification_days_before': 0}])
+    # The importing thread only flags the reload
+    assert monitor.manager._queue == []
+    
+    clock.set("2030-01-07T00:00:01")
+    assert monitor.wake() == ["Today is Imported!"]
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+import single_instance
+from single_instance import SingleInstance, send_command
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="tests the AF_UNIX layout")
+
+@pytest.fixture
+def runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    return tmp_path
+
+def test_forwards_commands_to_the_running_instance(runtime_dir):
+    instance = SingleInstance("ci")
+    assert instance.acquire()
+    received = []
+    
+    def handler(command, payload):
+        received.append((command, payload))
+        if command != "add":
+            raise ValueError(f"unknown command '{command}'")
+        return 42
+    
+    instance.listen(handler)
+    try:
+        assert not SingleInstance("ci").acquire()
+        assert os.stat(runtime_dir / "ci").st_mode & 0o777 == 0o700
+        assert send_command("add", {'name': "x"}, name="ci") == {'ok': True, 'result': 42}
+        assert send_command("bogus", name="ci") == {'ok': False, 'error': "unknown command 'bogus'"}
+        assert received == [("add", {'name': "x"}), ("bogus", {})]
+    finally:
+        instance.release()
+    assert send_command("show", name="ci") is None
+
+def test_rejects_a_shared_directory(runtime_dir):
+    (runtime_dir / "ci").mkdir(mode=0o777)
+    os.chmod(runtime_dir / "ci", 0o777)
+    with pytest.raises(PermissionError):
+        single_instance.instance_dir("ci")
+    # The app still starts, just without the single-instance guard
+    assert SingleInstance("ci").acquire()
+
+def test_listener_failure_releases_the_lock(tmp_path, monkeypatch):
+    # Longer than an AF_UNIX socket path may be
+    long_dir = tmp_path / ("d" * 120)
+    long_dir.mkdir()
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(long_dir))
+    
+    instance = SingleInstance("ci")
+    assert instance.acquire()
+    instance.listen(lambda command, payload: None)
+    assert instance._lock_file is None and instance._listener is None
+    assert os.listdir(long_dir / "ci") == ["instance.lock"]
+    
+    # A later launch is not locked out by an instance that cannot answer
+    other = SingleInstance("ci")
+    assert other.acquire()
+    other.release()
@@ -4,6 +4,15 @@ from typing import Dict, List
 class ThemeManager:
     """Manage themes and visual customization"""
     
+    CUSTOM_THEME_PREFIX = "custom_theme_"
+    
+    # Widget roles and the theme key each of their options is colored from
+    STYLE_ROLES = {
+        "window": {"fg_color": "window_bg"},
+        "text": {"text_color": "text_color"},
+        "accent_text": {"text_color": "accent_color"},
+    }
+    
     DEFAULT_THEMES = {
         "light": {
             "name": "Light",
@@ -69,7 +78,12 @@ class ThemeManager:
     
     def __init__(self, db_manager):
         self.db_manager = db_manager
+        # Parsed custom themes by name (None for names with no valid theme),
+        # so each theme's JSON is decoded once
+        self._custom_themes = {}
+        self._custom_themes_listed = False
         self.current_theme = self.load_current_theme()
+        self.styles = self.compile_styles(self.current_theme)
     
     def load_current_theme(self) -> Dict:
         """Load the current theme from database or default"""
@@ -85,19 +99,51 @@ class ThemeManager:
     
     def load_custom_theme(self, theme_name: str) -> Dict:
         """Load a custom theme from database"""
-        theme_data = self.db_manager.get_setting(f"custom_theme_{theme_name}")
-        if theme_data:
-            try:
-                return json.loads(theme_data)
-            except json.JSONDecodeError:
-                return None
-        return None
+        if theme_name in self._custom_themes:
+            return self._custom_themes[theme_name]
+        
+        theme_data = self.db_manager.get_setting(f"{self.CUSTOM_THEME_PREFIX}{theme_name}")
+        theme = self._parse_custom_theme(theme_data)
+        self._custom_themes[theme_name] = theme
+        return theme
+    
+    def load_custom_themes(self) -> Dict[str, Dict]:
+        """All saved custom themes by name, loaded with a single query"""
+        if not self._custom_themes_listed:
+            rows = self.db_manager.get_settings_with_prefix(self.CUSTOM_THEME_PREFIX)
+            for key, theme_data in rows:
+                theme_name = key[len(self.CUSTOM_THEME_PREFIX):]
+                if theme_name not in self._custom_themes:
+                    self._custom_themes[theme_name] = self._parse_custom_theme(theme_data)
+            self._custom_themes_listed = True
+        
+        return {name: theme for name, theme in sorted(self._custom_themes.items()) if theme}
+    
+    def _parse_custom_theme(self, theme_data: str) -> Dict:
+        """Decode a stored theme; rows that are not a valid theme load as None"""
+        if not theme_data:
+            return None
+        try:
+            theme = json.loads(theme_data)
+        except json.JSONDecodeError:
+            return None
+        # Themes are validated when saved; this only catches rows written
+        # before that or by hand
+        if not isinstance(theme, dict) or not self.validate_theme(theme):
+            return None
+        return theme
     
     def save_custom_theme(self, theme_name: str, theme_data: Dict) -> bool:
         """Save a custom theme to database"""
+        if not self.validate_theme(theme_data):
+            return False
+        
         try:
             theme_json = json.dumps(theme_data)
-            return self.db_manager.set_setting(f"custom_theme_{theme_name}", theme_json)
+            saved = self.db_manager.set_setting(f"{self.CUSTOM_THEME_PREFIX}{theme_name}", theme_json)
+            # Cache what a reload would parse, not the caller's mutable dict
+            self._custom_themes[theme_name] = json.loads(theme_json)
+            return saved
         except Exception:
             return False
     
@@ -107,6 +153,7 @@ class ThemeManager:
         if theme_name in self.DEFAULT_THEMES or self.load_custom_theme(theme_name):
             self.db_manager.set_setting("current_theme", theme_name)
             self.current_theme = self.load_current_theme()
+            self.styles = self.compile_styles(self.current_theme)
             return True
         return False
     
@@ -127,11 +174,28 @@ class ThemeManager:
                 }
             })
         
-        # Add custom themes (this would query the database for custom themes)
-        # For now, we'll just return default themes
+        # Add custom themes
+        for theme_id, theme_data in self.load_custom_themes().items():
+            themes.append({
+                "id": theme_id,
+                "name": theme_data.get("name", theme_id),
+                "type": "custom",
+                "preview_colors": {
+                    "bg": theme_data["bg_color"],
+                    "text": theme_data["text_color"],
+                    "accent": theme_data["accent_color"]
+                }
+            })
         
         return themes
     
+    def compile_styles(self, theme: Dict) -> Dict[str, Dict[str, str]]:
+        """Flatten a theme into widget options per role, e.g. {"text": {"text_color": ...}}"""
+        return {
+            role: {option: theme[key] for option, key in options.items()}
+            for role, options in self.STYLE_ROLES.items()
+        }
+    
     def get_current_theme(self) -> Dict:
         """Get the current active theme"""
         return self.current_theme
@@ -172,6 +236,41 @@ class ThemeManager:
             }
         }
 
+class ThemedWidgets:
+    """Registry of widgets colored by theme role, re-styled in place on theme changes"""
+    
+    # Destroyed widgets are dropped whenever the registry grows past this
+    PRUNE_THRESHOLD = 256
+    
+    def __init__(self, styles: Dict[str, Dict[str, str]]):
+        self.styles = styles
+        self._widgets = []
+        self._prune_at = self.PRUNE_THRESHOLD
+    
+    def create(self, widget_class, role: str, *args, **kwargs):
+        """Construct a widget with the current style for `role` and register it"""
+        return self.add(widget_class(*args, **kwargs, **self.styles[role]), role)
+    
+    def add(self, widget, role: str):
+        """Register an existing widget (already styled) under a role"""
+        self._widgets.append((widget, role))
+        
+        # Detail panels and dialogs are rebuilt often; forget their dead widgets
+        if len(self._widgets) >= self._prune_at:
+            self._widgets = [(w, r) for w, r in self._widgets if w.winfo_exists()]
+            self._prune_at = max(self.PRUNE_THRESHOLD, 2 * len(self._widgets))
+        return widget
+    
+    def apply(self, styles: Dict[str, Dict[str, str]]):
+        """Re-style every live registered widget in a single pass"""
+        self.styles = styles
+        alive = []
+        for widget, role in self._widgets:
+            if widget.winfo_exists():
+                widget.configure(**styles[role])
+                alive.append((widget, role))
+        self._widgets = alive
+
 class PriorityColorManager:
     """Manage priority-based color coding for events"""
     